@@ -1,28 +1,91 @@
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, stream_template, request, redirect, url_for, flash
 import os
-import sys
+import shutil
+import tempfile
+import threading
+import time
 from werkzeug.utils import secure_filename
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from pdf_interaction import PDFInteraction
 
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
+UPLOAD_CHUNK_SIZE = 1 << 16  # 64 KB
+STALE_UPLOAD_AGE = 3600  # Seconds after which a partial upload is taken to be abandoned
+
+# OCR text and analysis results are cached on disk only when PDF_DISK_CACHE=1 is set,
+# since on a server the cache would be shared by every user and fill the server account's home
+DISK_CACHE = os.environ.get('PDF_DISK_CACHE') == '1'
 
 app = Flask(__name__)
 app.secret_key = 'supersecretkey'
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-
-pdf_system = PDFInteraction()
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# mkstemp creates files readable only by their owner, so saved uploads are given
+# the mode a plain open() would have, as read from the process umask
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+UPLOAD_FILE_MODE = 0o666 & ~_UMASK
+
+# Remove partial uploads left behind by a worker that died mid-copy. Live uploads
+# keep being written to, so only files untouched for STALE_UPLOAD_AGE are removed
+def remove_stale_uploads(folder):
+    cutoff = time.time() - STALE_UPLOAD_AGE
+    for dirpath, _, filenames in os.walk(folder):
+        for name in filenames:
+            if not name.endswith('.part'):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+remove_stale_uploads(UPLOAD_FOLDER)
+
+# One PDFInteraction per worker thread, so concurrent requests under a
+# multi-threaded WSGI server don't replace each other's loaded PDF
+_local = threading.local()
+
+def get_pdf_system():
+    """Return the PDFInteraction owned by the current worker thread."""
+    if not hasattr(_local, 'pdf_system'):
+        _local.pdf_system = PDFInteraction(disk_cache=DISK_CACHE)
+    return _local.pdf_system
 
 # Helper to check allowed file type
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Helper to write an uploaded file to disk in large chunks. The upload goes to a
+# temporary file that replaces the target only once complete, so requests served
+# by other workers never open a partly written PDF
+def save_upload(file, filepath):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.part')
+    try:
+        with open(fd, 'wb', buffering=0) as out:
+            os.chmod(tmp_path, UPLOAD_FILE_MODE)
+            shutil.copyfileobj(file.stream, out, UPLOAD_CHUNK_SIZE)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# Helper to load an uploaded PDF by name
+def load_upload(pdf_system, filename):
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    return pdf_system.load_pdf(filepath)
+
+# Result pages are streamed so large extraction results are sent while they render.
+# Pages that show flashed messages are rendered in full, since streaming would
+# consume the messages only after the session cookie has been sent.
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
@@ -36,9 +99,9 @@ def index():
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            result = pdf_system.load_pdf(filepath)
-            return render_template('result.html', result=result, filename=filename)
+            save_upload(file, filepath)
+            result = get_pdf_system().load_pdf(filepath)
+            return stream_template('result.html', result=result, filename=filename)
         else:
             flash('Invalid file type. Only PDF allowed.')
             return redirect(request.url)
@@ -46,43 +109,43 @@ def index():
 
 @app.route('/process/<filename>')
 def process(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.process_pdf()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 @app.route('/analyze/<filename>')
 def analyze(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.analyze_pdf()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 @app.route('/toc/<filename>')
 def toc(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.extract_toc()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 @app.route('/index/<filename>')
 def index_cmd(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.extract_index()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 @app.route('/components/<filename>')
 def components(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.extract_components()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 @app.route('/component_tabs/<filename>')
 def component_tabs(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.extract_components()
     components = result.get('components', [])
     # If result is a list, use it directly; if dict, try to extract list
@@ -94,17 +157,11 @@ def component_tabs(filename):
 
 @app.route('/upload_component_pdf/<filename>/<component_number>', methods=['POST'])
 def upload_component_pdf(filename, component_number):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
-    result = pdf_system.extract_components()
-    components = result.get('components', [])
-    
-    # Find the component by number - Fixed the duplicate get() call
-    component = None
-    for comp in components:
-        if str(comp.get('number', '')) == str(component_number):
-            component = comp
-            break
+    # Find the component by number; the components listed by component_tabs are
+    # cached with the PDF's content, so this doesn't extract them again
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
+    component = pdf_system.get_component(component_number)
     
     if not component:
         flash('Component not found.')
@@ -126,7 +183,7 @@ def upload_component_pdf(filename, component_number):
         comp_dir = os.path.join(app.config['UPLOAD_FOLDER'], f"{component_number}_{safe_title}")
         os.makedirs(comp_dir, exist_ok=True)
         filename_secure = secure_filename(file.filename)
-        file.save(os.path.join(comp_dir, filename_secure))
+        save_upload(file, os.path.join(comp_dir, filename_secure))
         flash(f'PDF uploaded for component {component_number}: {component.get("title", "")}')
     else:
         flash('Invalid file type. Only PDF allowed.')
@@ -135,17 +192,17 @@ def upload_component_pdf(filename, component_number):
 
 @app.route('/summary/<filename>')
 def summary(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.get_pdf_summary()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 @app.route('/analysis/<filename>')
 def analysis(filename):
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    pdf_system.load_pdf(filepath)
+    pdf_system = get_pdf_system()
+    load_upload(pdf_system, filename)
     result = pdf_system.get_full_analysis()
-    return render_template('result.html', result=result, filename=filename)
+    return stream_template('result.html', result=result, filename=filename)
 
 if __name__ == '__main__':
     app.run(debug=True)
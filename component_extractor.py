@@ -3,13 +3,142 @@ Component Extractor - Specialized module for extracting structured lists and com
 """
 
 import re
+import string
 import logging
-from collections import OrderedDict
+import functools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _iter_lines(text):
+    """Yield the lines of text one at a time without building a list of them."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+# Title group of each component pattern branch -> its identifier group
+_COMPONENT_BRANCHES = {
+    'title': 'number',
+    'letter_title': 'letter',
+    'roman_title': 'roman',
+    'indented_title': 'indented_number',
+    'colon_title': 'colon_number',
+    'hyphen_title': 'hyphen_number',
+    'joined_title': 'joined_number'
+}
+
+# Component line patterns combined into a single alternation regex
+_COMPONENT_PATTERN = re.compile(
+    r'^(?:'
+    # Numbered component with title
+    # e.g. "1. Vision and Mission of the University and Department"
+    r'(?P<number>\d+)[.\)]\s+(?P<title>.+)'
+    
+    # Lettered component with title
+    # e.g. "a) Faculty profiles and individual timetables"
+    r'|(?P<letter>[a-zA-Z])[.\)]\s+(?P<letter_title>.+)'
+    
+    # Roman numeral component with title
+    # e.g. "i. Course handout and closure report"
+    r'|(?P<roman>[ivxIVX]+)[.\)]\s+(?P<roman_title>.+)'
+    
+    # Indented component
+    # e.g. "    4. Student name lists"
+    r'|\s+(?P<indented_number>\d+)[.\)]\s+(?P<indented_title>.+)'
+    
+    # Numbered component with colon
+    # e.g. "6: Assignment questions with solution"
+    r'|(?P<colon_number>\d+):\s+(?P<colon_title>.+)'
+    
+    # Numbered component with hyphen
+    # e.g. "7 - Mid Term Exam question paper"
+    r'|(?P<hyphen_number>\d+)\s*-\s+(?P<hyphen_title>.+)'
+    
+    # Numbered component with no space
+    # e.g. "8.Assignment questions"
+    r'|(?P<joined_number>\d+)[.\):](?P<joined_title>.+)'
+    r')$'
+)
+
+# Category header patterns
+_CATEGORY_PATTERNS = (
+    # Pattern 1: Category header with colon
+    # e.g. "COURSE INFORMATION:"
+    re.compile(r'^(?P<category>[A-Z][A-Z\s]+):'),
+    
+    # Pattern 2: Category header with underline
+    # e.g. "ASSESSMENT DETAILS"
+    re.compile(r'^(?P<category>[A-Z][A-Z\s]+)$'),
+    
+    # Pattern 3: Category with numbering
+    # e.g. "I. GENERAL INFORMATION"
+    re.compile(r'^(?P<prefix>[IVX]+\.)\s*(?P<category>[A-Z][A-Z\s]+)')
+)
+
+# Fallback patterns for lines that start with a number
+_FLEXIBLE_NUM = re.compile(r'^(\d+)[\.\s\)\:\-]+\s*(.+)$')
+_LOOSE_NUM = re.compile(r'^(\d+)[\.\s\)\:\-]*\s*(.*)$')
+
+# Characters that can start a category header or a lettered/roman component
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LETTERS = frozenset(string.ascii_letters)
+_ROMAN_LETTERS = frozenset('ivxIVX')
+
+def _could_be_component(line):
+    """Rule out, from its first characters alone, a line no component pattern accepts."""
+    first = line[:1]
+    if first.isdecimal() or first.isspace() or first in _ROMAN_LETTERS:
+        return True
+    # Other letters only start the lettered pattern, e.g. "a) ..."
+    return first in _LETTERS and line[1:2] in ('.', ')')
+
+# Headers and list items repeat across sections, so parse each distinct line once
+@functools.lru_cache(maxsize=4096)
+def _category_of(line):
+    """Return the category named by a header line, or None."""
+    for pattern in _CATEGORY_PATTERNS:
+        match = pattern.match(line)
+        if match:
+            return match.group('category').strip()
+    return None
+
+@functools.lru_cache(maxsize=4096)
+def _component_fields(line):
+    """Return the (number, title) of a component line, or None."""
+    # A single match tells us which pattern branch applies
+    match = _COMPONENT_PATTERN.match(line)
+    if match:
+        # The title group closes each branch, so it identifies the branch
+        title_group = match.lastgroup
+        number = match.group(_COMPONENT_BRANCHES[title_group])
+        title = match.group(title_group).strip()
+        
+        # Use this branch if we have enough info
+        if number and title:
+            return number, title
+            
+    # More flexible fallback patterns
+    # Check for lines that start with a number followed by any delimiter
+    more_flexible_match = _FLEXIBLE_NUM.match(line.strip())
+    if more_flexible_match:
+        number, content = more_flexible_match.groups()
+        return number, content.strip()
+        
+    # Check for standalone numbered items as a fallback (most flexible pattern)
+    numbered_match = _LOOSE_NUM.match(line.strip())
+    if numbered_match:
+        number, content = numbered_match.groups()
+        if content.strip():  # Only use it if there's actual content
+            return number, content.strip()
+        
+    return None
+
 class Component:
     """Represents a single component or item from a structured list."""
     def __init__(self, number, title, description=None, category=None, raw_text=None):
@@ -59,103 +188,68 @@ class ComponentCategory:
 class ComponentExtractor:
     """Extract and structure component lists from PDF text."""
     
+    # Line-level patterns used in the extraction and post-processing loops
+    _NEW_COMPONENT = re.compile(r'^\d+[.\)]\s+')
+    _STANDALONE_NUM = re.compile(r'^(\d+)[.\)]\s*$')
+    _NUMONLY = re.compile(r'^\d+\.?\s*$')
+    _PARENTHESIZED = re.compile(r'\([^)]*\)')
+    _WS = re.compile(r'\s+')
+    _DUP_PUNCT = re.compile(r'[\-–.,;:]+(\s+[\-–.,;:]+)+')
+    _PUNCTUATION = '-–.,;:'
+    
+    # Known components from course file index based on observed patterns
+    _KNOWN_TITLES = {
+        "1": "Vision and Mission of the University and Department",
+        "2": "Faculty profiles and individual timetables",
+        "3": "Course handout and closure report",
+        "4": "Name list of students (section wise)",
+        "5": "Mid Term Exam question papers"
+    }
+    
+    # Title openings that mark a continuation of the previous component
+    _CONTINUATION_VERBS = ("is ", "are ", "was ", "were ", "teaching ")
+    
     def __init__(self):
         """Initialize the component extractor."""
         self.components = []
         self.categories = []
-        self.component_patterns = self._compile_component_patterns()
-        self.category_patterns = self._compile_category_patterns()
-        
-    def _compile_component_patterns(self):
-        """Compile regex patterns for component extraction."""
-        patterns = [
-            # Pattern 1: Numbered component with title
-            # e.g. "1. Vision and Mission of the University and Department"
-            re.compile(r'^(?P<number>\d+)[.\)]\s+(?P<title>.+)$'),
-            
-            # Pattern 2: Lettered component with title
-            # e.g. "a) Faculty profiles and individual timetables"
-            re.compile(r'^(?P<letter>[a-zA-Z])[.\)]\s+(?P<title>.+)$'),
-            
-            # Pattern 3: Roman numeral component with title
-            # e.g. "i. Course handout and closure report"
-            re.compile(r'^(?P<roman>[ivxIVX]+)[.\)]\s+(?P<title>.+)$'),
-            
-            # Pattern 4: Indented component
-            # e.g. "    4. Student name lists"
-            re.compile(r'^\s+(?P<number>\d+)[.\)]\s+(?P<title>.+)$'),
-            
-            # Pattern 5: Component with description
-            # e.g. "5. Mid Term Exam (MTE) question papers with CO mapping and solutions"
-            re.compile(r'^(?P<number>\d+)[.\)]\s+(?P<title>[^(]+)(?:\((?P<description>[^)]+)\))?'),
-            
-            # Pattern 6: Numbered component with colon
-            # e.g. "6: Assignment questions with solution"
-            re.compile(r'^(?P<number>\d+):\s+(?P<title>.+)$'),
-            
-            # Pattern 7: Numbered component with hyphen
-            # e.g. "7 - Mid Term Exam question paper"
-            re.compile(r'^(?P<number>\d+)\s*-\s+(?P<title>.+)$'),
-            
-            # Pattern 8: Numbered component with no space
-            # e.g. "8.Assignment questions"
-            re.compile(r'^(?P<number>\d+)[.\):](?P<title>.+)$')
-        ]
-        return patterns
-    
-    def _compile_category_patterns(self):
-        """Compile regex patterns for category extraction."""
-        patterns = [
-            # Pattern 1: Category header with colon
-            # e.g. "COURSE INFORMATION:"
-            re.compile(r'^(?P<category>[A-Z][A-Z\s]+):'),
-            
-            # Pattern 2: Category header with underline
-            # e.g. "ASSESSMENT DETAILS"
-            re.compile(r'^(?P<category>[A-Z][A-Z\s]+)$'),
-            
-            # Pattern 3: Category with numbering
-            # e.g. "I. GENERAL INFORMATION"
-            re.compile(r'^(?P<prefix>[IVX]+\.)\s*(?P<category>[A-Z][A-Z\s]+)')
-        ]
-        return patterns
+        self._display_cache = None  # (components, categories, sizes, text)
+        self._summary_cache = None  # (components, categories, sizes, text)
+        self.component_pattern = _COMPONENT_PATTERN
+        self.category_patterns = _CATEGORY_PATTERNS
         
     def extract_components_from_text(self, text):
         """Extract components from text."""
         self.components = []
         self.categories = []
-        lines = text.split('\n')
-        
         current_category = None
         category_components = []
         pending_number = None  # Track pending component number across lines
         
-        # First pass - identify components and categories
-        i = 0
-        while i < len(lines):
-            line = lines[i].rstrip()
+        # First pass - identify components and categories, one line at a time
+        for line in _iter_lines(text):
+            line = line.rstrip()
             if not line.strip():
-                i += 1
                 continue
                 
+            category_match = self._match_category(line)
+            
             # If we have a pending number from previous line, try to combine with this line
             if pending_number:
                 # If current line isn't a category or a new component, merge with pending number
-                if not self._match_category(line) and not re.match(r'^\d+[.\)]\s+', line):
+                if not category_match and not self._NEW_COMPONENT.match(line):
                     # Create a component from the pending number and current line
                     component = Component(pending_number, line.strip(), raw_text=f"{pending_number}. {line.strip()}")
                     self.components.append(component)
                     if current_category:
                         category_components.append(component)
                     pending_number = None
-                    i += 1
                     continue
                 else:
                     # This is a new component or category, discard the pending number
                     pending_number = None
             
             # Check for category patterns
-            category_match = self._match_category(line)
             if category_match:
                 # If we had a previous category, save it
                 if current_category and category_components:
@@ -164,14 +258,12 @@ class ComponentExtractor:
                 # Start new category
                 current_category = category_match
                 category_components = []
-                i += 1
                 continue
                 
             # Check for standalone number pattern (like "2." or "3." on a line by itself)
-            standalone_number_match = re.match(r'^(\d+)[.\)]\s*$', line.strip())
+            standalone_number_match = self._STANDALONE_NUM.match(line.strip())
             if standalone_number_match:
                 pending_number = standalone_number_match.group(1)
-                i += 1
                 continue
                 
             # Check for component patterns
@@ -180,11 +272,6 @@ class ComponentExtractor:
                 self.components.append(component)
                 if current_category:
                     category_components.append(component)
-                i += 1
-                continue
-            
-            # If we reached here, line couldn't be matched - move to next line
-            i += 1
                     
         # Add the final category if exists
         if current_category and category_components:
@@ -199,74 +286,41 @@ class ComponentExtractor:
         
     def _match_category(self, line):
         """Check if line matches a category pattern."""
-        for pattern in self.category_patterns:
-            match = pattern.match(line)
-            if match:
-                groups = match.groupdict()
-                if 'category' in groups:
-                    return groups['category'].strip()
-        return None
+        # Every category pattern starts with an uppercase letter
+        if line[:1] not in _UPPERCASE:
+            return None
+        return _category_of(line)
         
     def _parse_component_line(self, line):
         """Parse a single line of text to extract component information."""
-        # Try all patterns
-        for pattern in self.component_patterns:
-            match = pattern.match(line)
-            if match:
-                groups = match.groupdict()
-                
-                # Get number/identifier
-                number = None
-                if 'number' in groups and groups['number']:
-                    number = groups['number']
-                elif 'letter' in groups and groups['letter']:
-                    number = groups['letter']
-                elif 'roman' in groups and groups['roman']:
-                    number = groups['roman']
-                    
-                # Get title and description
-                title = groups.get('title', '').strip()
-                description = groups.get('description', '').strip() if 'description' in groups else None
-                
-                # Create component if we have enough info
-                if number and title:
-                    return Component(number, title, description, raw_text=line)
-                    
-        # More flexible fallback patterns
-        # Check for lines that start with a number followed by any delimiter
-        more_flexible_match = re.match(r'^(\d+)[\.\s\)\:\-]+\s*(.+)$', line.strip())
-        if more_flexible_match:
-            number, content = more_flexible_match.groups()
-            return Component(number, content.strip(), raw_text=line)
-            
-        # Check for standalone numbered items as a fallback (most flexible pattern)
-        numbered_match = re.match(r'^(\d+)[\.\s\)\:\-]*\s*(.*)$', line.strip())
-        if numbered_match:
-            number, content = numbered_match.groups()
-            if content.strip():  # Only create if there's actual content
-                return Component(number, content.strip(), raw_text=line)
-            
+        if not _could_be_component(line):
+            return None
+        fields = _component_fields(line)
+        if fields:
+            # Build a fresh Component so cached results are never shared
+            number, title = fields
+            return Component(number, title, raw_text=line)
         return None
     
     def _post_process_components(self):
         """Post-process components to improve title quality and context."""
-        # Known components from course file index based on observed patterns
-        known_titles = {
-            "1": "Vision and Mission of the University and Department",
-            "2": "Faculty profiles and individual timetables",
-            "3": "Course handout and closure report",
-            "4": "Name list of students (section wise)",
-            "5": "Mid Term Exam question papers"
-        }
-        
+        # Most lists have no incomplete titles, so only the final cleanup applies
+        if not any(self._needs_fixup(component) for component in self.components):
+            self._clean_up_titles()
+            return
+            
         # First pass: fix known components with predefined titles
         for component in self.components:
-            if component.number in known_titles and (
-                component.title.startswith('(') or 
-                "teaching" in component.title.lower() or
-                len(component.title.strip()) < 15  # Short titles are likely incomplete
+            known_title = self._KNOWN_TITLES.get(component.number)
+            if known_title is None:
+                continue
+            title = component.title
+            if (
+                title.startswith('(') or 
+                len(title.strip()) < 15 or  # Short titles are likely incomplete
+                "teaching" in title.lower()
             ):
-                component.title = known_titles[component.number]
+                component.title = known_title
         
         # Second pass: fix components based on contextual information
         previous_title = ""
@@ -280,7 +334,7 @@ class ComponentExtractor:
             title = component.title
             
             # For very incomplete titles just with numbers 
-            if re.match(r'^\d+\.?\s*$', title):
+            if self._NUMONLY.match(title):
                 if i > 0 and previous_title:
                     component.title = f"{previous_title} (continued)"
                 continue
@@ -289,11 +343,11 @@ class ComponentExtractor:
             if title.startswith('('):
                 if i > 0 and previous_title:
                     # Extract the main subject from previous title
-                    main_subject = re.sub(r'\([^)]*\)', '', previous_title).strip()
+                    main_subject = self._PARENTHESIZED.sub('', previous_title).strip()
                     component.title = f"{main_subject} {title}"
             
             # For titles starting with verbs indicating continuation
-            elif any(title.lower().startswith(verb) for verb in ["is ", "are ", "was ", "were ", "teaching "]):
+            elif title.lower().startswith(self._CONTINUATION_VERBS):
                 if i > 0:
                     # Find a suitable subject from previous context
                     if not main_topic and i > 1:
@@ -317,33 +371,49 @@ class ComponentExtractor:
                 if not main_topic:
                     main_topic = ' '.join(title.split()[:3])
         
-        # Final cleanup
+        self._clean_up_titles()
+    
+    def _needs_fixup(self, component):
+        """Check whether the first two post-processing passes could change this component's title."""
+        title = component.title
+        if title.startswith('(') or self._NUMONLY.match(title):
+            return True
+        lowered = title.lower()
+        if lowered.startswith(self._CONTINUATION_VERBS):
+            return True
+        return component.number in self._KNOWN_TITLES and (len(title.strip()) < 15 or "teaching" in lowered)
+    
+    def _clean_up_titles(self):
+        """Final cleanup of whitespace and punctuation in component titles."""
         for component in self.components:
-            # Clean up any awkward punctuation
-            component.title = re.sub(r'\s+', ' ', component.title)  # Remove excess spaces
-            component.title = re.sub(r'[\-–.,;:]+(\s+[\-–.,;:]+)+', '. ', component.title)  # Fix duplicate punctuation
+            # Clean up any awkward punctuation, skipping the regexes when they can't change anything
+            title = component.title
+            if '  ' in title or not title.isprintable():
+                title = self._WS.sub(' ', title)  # Remove excess spaces
+            if any(p in title for p in self._PUNCTUATION):
+                title = self._DUP_PUNCT.sub('. ', title)  # Fix duplicate punctuation
+            component.title = title
     
     def organize_by_categories(self):
         """Organize components into categories based on numbering or explicit categories."""
         if not self.categories:
             # If we don't have explicit categories, try to infer from numbering
-            numeric_categories = {}
+            numeric_groups = {}
             for component in self.components:
                 try:
                     # Try to convert to int for grouping
                     num = int(component.number)
-                    category_id = (num - 1) // 10  # Group by tens
-                    category_name = f"Components {category_id*10+1}-{min((category_id+1)*10, len(self.components))}"
-                    
-                    if category_id not in numeric_categories:
-                        numeric_categories[category_id] = ComponentCategory(category_name, [])
-                    
-                    numeric_categories[category_id].components.append(component)
                 except ValueError:
                     # Skip non-numeric components for categorization
-                    pass
-                    
-            self.categories = list(numeric_categories.values())
+                    continue
+                numeric_groups.setdefault((num - 1) // 10, []).append(component)  # Group by tens
+            
+            # Plain dicts keep insertion order, so categories appear in first-seen order
+            total = len(self.components)
+            self.categories = [
+                ComponentCategory(f"Components {category_id*10+1}-{min((category_id+1)*10, total)}", group)
+                for category_id, group in numeric_groups.items()
+            ]
             
         return self.categories
     
@@ -355,10 +425,25 @@ class ComponentExtractor:
         """Get the category structure as a list of dictionaries."""
         return [cat.to_dict() for cat in self.categories]
         
+    def _cache_matches(self, cached):
+        """Check whether a cached output was built from the current components and categories."""
+        return (
+            cached is not None and
+            cached[0] is self.components and
+            cached[1] is self.categories and
+            cached[2] == (len(self.components), len(self.categories))
+        )
+    
+    def _cache_output(self, text):
+        """Wrap an output with the components and categories it was built from."""
+        return (self.components, self.categories, (len(self.components), len(self.categories)), text)
+        
     def display_components(self):
         """Return a formatted string representation of the components."""
         if not self.components:
             return "No components found."
+        if self._cache_matches(self._display_cache):
+            return self._display_cache[3]
             
         output = []
         
@@ -373,12 +458,15 @@ class ComponentExtractor:
             for component in self.components:
                 output.append(str(component))
                 
-        return "\n".join(output)
+        self._display_cache = self._cache_output("\n".join(output))
+        return self._display_cache[3]
         
     def summarize_components(self):
         """Generate a summary of the components."""
         if not self.components:
             return "No components found."
+        if self._cache_matches(self._summary_cache):
+            return self._summary_cache[3]
             
         num_components = len(self.components)
         
@@ -394,20 +482,21 @@ class ComponentExtractor:
             doc_type = "Inventory"
             
         # Build summary
-        summary = f"Document contains {num_components} components and appears to be a {doc_type}.\n\n"
+        summary = [f"Document contains {num_components} components and appears to be a {doc_type}.\n\n"]
         
         # Add category information if available
         if self.categories:
-            summary += f"Organized into {len(self.categories)} categories:\n"
+            summary.append(f"Organized into {len(self.categories)} categories:\n")
             for category in self.categories:
-                summary += f"- {category.name}: {len(category.components)} items\n"
+                summary.append(f"- {category.name}: {len(category.components)} items\n")
         
         # List first few components
-        summary += f"\nFirst {min(5, num_components)} components:\n"
+        summary.append(f"\nFirst {min(5, num_components)} components:\n")
         for i, component in enumerate(self.components[:5]):
-            summary += f"{i+1}. {component.title}\n"
+            summary.append(f"{i+1}. {component.title}\n")
             
         if num_components > 5:
-            summary += f"... and {num_components - 5} more components\n"
+            summary.append(f"... and {num_components - 5} more components\n")
             
-        return summary 
\ No newline at end of file
+        self._summary_cache = self._cache_output("".join(summary))
+        return self._summary_cache[3] 
\ No newline at end of file
@@ -53,13 +53,15 @@ def display_result(result):
         print("  Use the 'components' command for more detailed component extraction")
     
     # Remove status, message, and already displayed fields from output
-    fields_to_remove = ["status", "message", "display", "summary", "auto_processed"]
-    clean_result = {k: v for k, v in result.items() if k not in fields_to_remove}
+    clean_result = dict(result)
+    for field in ("status", "message", "display", "summary", "auto_processed"):
+        clean_result.pop(field, None)
         
     # Pretty print remaining data if there's any
     if clean_result:
-        print(json.dumps(clean_result, indent=2, default=str))
-        print()
+        # Write straight to stdout rather than building the whole JSON string first
+        json.dump(clean_result, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n\n")
 
 def interactive_mode():
     """Run the application in interactive mode."""
@@ -5,11 +5,12 @@ PDF Analyzer Module - Provides text analysis and understanding capabilities
 import os
 import re
 import logging
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from collections import Counter, defaultdict
-import math
+import functools
+import heapq
+import bisect
+import hashlib
+import threading
+from collections import Counter
 import json
 import importlib.util
 import sys
@@ -18,10 +19,18 @@ import sys
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _get_nltk():
+    """Import NLTK on first use, since loading it is slow."""
+    import nltk
+    return nltk
+
 # Function to download NLTK data
 def download_nltk_data():
     """Download required NLTK data packages."""
     try:
+        nltk = _get_nltk()
+        
         # Create nltk_data directory in user home if it doesn't exist
         nltk_data_path = os.path.join(os.path.expanduser("~"), "nltk_data")
         os.makedirs(nltk_data_path, exist_ok=True)
@@ -30,7 +39,7 @@ def download_nltk_data():
         nltk.data.path.append(nltk_data_path)
         
         # Download required packages
-        resources = ['punkt', 'stopwords']
+        resources = ['punkt']
         for resource in resources:
             try:
                 nltk.download(resource, quiet=True, download_dir=nltk_data_path)
@@ -41,25 +50,190 @@ def download_nltk_data():
     except Exception as e:
         logger.error(f"Error setting up NLTK data: {str(e)}")
 
-# Download NLTK data at module load time
-download_nltk_data()
+# Basic sentence boundary: whitespace after terminal punctuation
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Words are runs of letters and digits; only used when NLTK's tokenizer isn't available
+_WORD_RE = re.compile(r'[^\W_]+')
+
+@functools.lru_cache(maxsize=None)
+def _sentence_tokenizer():
+    """Load NLTK's English Punkt sentence tokenizer once."""
+    return _get_nltk().data.load('tokenizers/punkt/english.pickle')
+
+@functools.lru_cache(maxsize=None)
+def _openai_available():
+    """Check once whether LangChain, its OpenAI bindings and an API key are available."""
+    if not (importlib.util.find_spec("langchain") and importlib.util.find_spec("langchain_openai")):
+        return False
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+        if os.getenv("OPENAI_API_KEY"):
+            logger.info("OpenAI integration available")
+            return True
+    except Exception as e:
+        logger.warning(f"OpenAI API key not found or error loading: {str(e)}")
+    return False
+
+# Topics on longer documents are drawn from this many leading characters
+TOPIC_SCAN_CHARS = 200_000
+
+# English stopword list shipped with the package, so no corpus download is needed
+STOPWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdf_analyzer_data", "stopwords_english.txt")
+
+@functools.lru_cache(maxsize=None)
+def _english_stopwords():
+    """Load the bundled English stopword list once, falling back to NLTK's corpus."""
+    try:
+        with open(STOPWORDS_FILE, 'r', encoding='utf-8') as f:
+            return frozenset(f.read().split())
+    except OSError as e:
+        logger.warning(f"Bundled stopword list not available: {str(e)}")
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words('english'))
+
+# Directory holding cached analysis results, and the most it may hold
+ANALYSIS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf_analyzer")
+ANALYSIS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Part of every analysis cache key; bump it whenever a change to the analyses changes
+# their results, so entries written by older code are no longer used
+ANALYSIS_CACHE_VERSION = 3
+
+# The cache directory is checked against its size limit after this many writes
+CACHE_PRUNE_INTERVAL = 32
+
+class AnalysisCache:
+    """Cache of analysis results stored as JSON files, one per key, dropping the least recently used past max_bytes."""
+    def __init__(self, cache_dir=ANALYSIS_CACHE_DIR, max_bytes=ANALYSIS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._puts = 0
+        
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+        
+    def get(self, key):
+        """Return the cached result for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                result = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable analysis cache entry {key}: {str(e)}")
+            return None
+            
+        # Mark the entry as recently used, so pruning removes it last
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+            
+    def put(self, key, result):
+        """Store a JSON-serializable result under key."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(result, file)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache analysis result {key}: {str(e)}")
+            return
+            
+        self._puts += 1
+        if self._puts % CACHE_PRUNE_INTERVAL == 1:
+            self.prune()
+            
+    def prune(self):
+        """Remove the least recently used entries until the cache holds at most max_bytes."""
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith('.json'):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+                        
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        except OSError as e:
+            logger.warning(f"Could not prune the analysis cache: {str(e)}")
+
+class _NoCache:
+    """Stand-in for AnalysisCache that stores nothing."""
+    def get(self, key):
+        return None
+        
+    def put(self, key, result):
+        pass
+
+# Basic lexicon-based sentiment words
+_POSITIVE_WORDS = frozenset({"good", "great", "excellent", "positive", "best", "better", 
+                             "advantage", "benefit", "success", "successful", "improve",
+                             "improved", "improvement", "recommended", "recommend"})
+_NEGATIVE_WORDS = frozenset({"bad", "poor", "negative", "worst", "worse", "disadvantage",
+                             "problem", "issue", "fault", "fail", "failed", "failure",
+                             "difficult", "difficulty", "concern", "concerns"})
 
 class PDFAnalyzer:
-    def __init__(self, text_content=None):
-        """Initialize the analyzer with optional text content."""
+    # NLTK resources are checked, and downloaded if missing, once per process
+    _nltk_checked = False
+    _nltk_available = True
+    
+    def __init__(self, text_content=None, cache=None):
+        """Initialize the analyzer with optional text content and result cache, or cache=False for none."""
         self.text_content = text_content
+        if cache is None:
+            cache = AnalysisCache()
+        elif cache is False:
+            cache = _NoCache()
+        self.cache = cache
+        self._text_digest = None
+        self._text_lower = None
+        self._tokens = None  # Lowercased words of the whole text
+        self._sentence_tokens = None  # Lowercased words of each sentence
+        self._sentence_lengths = None  # Token count of each sentence, punctuation included
+        self._sentence_index = None  # Word -> ids of the sentences containing it
+        self._word_count = None  # Token count of the text as written, punctuation included
         self.sentences = []
         self.keywords = []
         self.summary = ""
         self.topics = {}
         self.entities = []
-        self.use_openai = False
-        self.nltk_available = True
+        self.use_openai = _openai_available()
         
-        # Verify NLTK resources
+    @classmethod
+    def _check_nltk_resources(cls):
+        """Verify NLTK resources, downloading them only if they are missing."""
+        if cls._nltk_checked:
+            return cls._nltk_available
+            
+        try:
+            nltk = _get_nltk()
+        except ImportError as e:
+            logger.error(f"NLTK not installed: {str(e)}")
+            cls._nltk_available = False
+            cls._nltk_checked = True
+            return cls._nltk_available
+            
         try:
             nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
         except LookupError as e:
             logger.error(f"NLTK resources not available: {str(e)}")
             logger.info("Trying to download missing NLTK resources...")
@@ -68,53 +242,120 @@ class PDFAnalyzer:
             # Check again
             try:
                 nltk.data.find('tokenizers/punkt')
-                nltk.data.find('corpora/stopwords')
             except LookupError:
                 logger.error("Failed to download NLTK resources. Advanced text analysis will be limited.")
-                self.nltk_available = False
-        
-        # Check if LangChain and OpenAI modules are available
-        if importlib.util.find_spec("langchain") and importlib.util.find_spec("langchain_openai"):
-            try:
-                from dotenv import load_dotenv
-                load_dotenv()
-                api_key = os.getenv("OPENAI_API_KEY")
-                if api_key:
-                    self.use_openai = True
-                    logger.info("OpenAI integration available")
-            except Exception as e:
-                logger.warning(f"OpenAI API key not found or error loading: {str(e)}")
+                cls._nltk_available = False
                 
+        cls._nltk_checked = True
+        return cls._nltk_available
+        
+    @property
+    def nltk_available(self):
+        """Whether NLTK's sentence tokenizer can be used, checked on first access."""
+        return self._check_nltk_resources()
+        
     def set_text(self, text_content):
         """Set the text content to analyze."""
         self.text_content = text_content
+        self._text_digest = None
+        self._text_lower = None
+        self._tokens = None  # Lowercased words of the whole text
+        self._sentence_tokens = None  # Lowercased words of each sentence
+        self._sentence_lengths = None  # Token count of each sentence, punctuation included
+        self._sentence_index = None  # Word -> ids of the sentences containing it
+        self._word_count = None  # Token count of the text as written, punctuation included
         self.sentences = []
         self.keywords = []
         self.summary = ""
         self.topics = {}
         self.entities = []
     
+    def _cache_key(self, name, *params):
+        """Build a cache key from a digest of the text, the analysis version, name and parameters, and the tokenizer."""
+        if self._text_digest is None:
+            self._text_digest = hashlib.sha256(self.text_content.encode('utf-8', 'surrogatepass')).hexdigest()
+        # Tokens, and so results, can change between NLTK versions
+        tokenizer = f"nltk{_get_nltk().__version__}" if self.nltk_available else "regex"
+        return "_".join([self._text_digest, f"v{ANALYSIS_CACHE_VERSION}", name] + [str(param) for param in params] + [tokenizer])
+        
+    def _word_tokenize(self, text):
+        """Split text into words and punctuation with NLTK, or into runs of letters and digits without it."""
+        if self.nltk_available:
+            return _get_nltk().word_tokenize(text)
+        return _WORD_RE.findall(text)
+        
+    def _ensure_text_lower(self):
+        """Lowercase the whole text once and share the copy between analyses."""
+        if self._text_lower is None:
+            self._text_lower = self.text_content.lower()
+        return self._text_lower
+        
+    def _ensure_tokens(self):
+        """Tokenize the whole text once and share the tokens between analyses."""
+        if self._tokens is None:
+            # Intern tokens so repeats share one string object and its cached hash
+            self._tokens = list(map(sys.intern, self._word_tokenize(self._ensure_text_lower())))
+        return self._tokens
+        
+    def _ensure_sentence_tokens(self):
+        """Tokenize each sentence once and share the tokens, and their counts, between analyses."""
+        if self._sentence_tokens is None:
+            sentence_tokens = []
+            sentence_lengths = []
+            for sentence in self.sentences:
+                # Lowercase after tokenizing, so the same pass counts the tokens of the sentence as written
+                tokens = self._word_tokenize(sentence)
+                sentence_lengths.append(len(tokens))
+                sentence_tokens.append([sys.intern(token.lower()) for token in tokens])
+            self._sentence_tokens = sentence_tokens
+            self._sentence_lengths = sentence_lengths
+        return self._sentence_tokens
+        
+    def _ensure_word_count(self):
+        """Count the tokens of the text as written once, reusing a count cached for this text."""
+        if self._word_count is None:
+            cache_key = self._cache_key("words")
+            word_count = self.cache.get(cache_key)
+            if word_count is None:
+                word_count = len(self._word_tokenize(self.text_content))
+                self.cache.put(cache_key, word_count)
+            self._word_count = word_count
+        return self._word_count
+        
+    def _ensure_sentence_index(self):
+        """Build an inverted index from each token to the sentences containing it."""
+        if self._sentence_index is None:
+            index = {}
+            for i, words in enumerate(self._ensure_sentence_tokens()):
+                for word in set(words):
+                    index.setdefault(word, []).append(i)
+            self._sentence_index = index
+        return self._sentence_index
+        
     def preprocess_text(self):
         """Preprocess the text content for analysis."""
         if not self.text_content:
             logger.error("No text content to analyze")
             return False
         
+        self._sentence_tokens = None
+        self._sentence_lengths = None
+        self._sentence_index = None
         if not self.nltk_available:
             # Simple fallback for sentence splitting if NLTK is not available
-            self.sentences = [s.strip() for s in self.text_content.split('.') if s.strip()]
+            self.sentences = [s for s in _SENT_SPLIT_RE.split(self.text_content.strip()) if s]
             logger.info(f"Used basic sentence splitting, extracted {len(self.sentences)} sentences")
             return bool(self.sentences)
             
         try:
             # Tokenize the text into sentences
-            self.sentences = sent_tokenize(self.text_content)
+            self.sentences = _sentence_tokenizer().tokenize(self.text_content)
             logger.info(f"Extracted {len(self.sentences)} sentences")
             return True
         except Exception as e:
             logger.error(f"Error preprocessing text: {str(e)}")
             # Fallback to basic sentence splitting
-            self.sentences = [s.strip() for s in self.text_content.split('.') if s.strip()]
+            self.sentences = [s for s in _SENT_SPLIT_RE.split(self.text_content.strip()) if s]
             logger.info(f"Fallback: Basic sentence splitting, extracted {len(self.sentences)} sentences")
             return bool(self.sentences)
     
@@ -124,84 +365,113 @@ class PDFAnalyzer:
             logger.error("No text content to analyze")
             return []
         
-        if not self.nltk_available:
-            # Simple fallback for keyword extraction
-            words = self.text_content.lower().split()
-            # Filter out short words
-            words = [w for w in words if len(w) > 3]
-            # Count frequencies
-            word_freq = Counter(words)
-            # Get most common words
-            self.keywords = [word for word, count in word_freq.most_common(top_n)]
-            logger.info(f"Used basic keyword extraction, found {len(self.keywords)} keywords")
-            return self.keywords
-            
         try:
-            # Tokenize and filter stopwords
-            stop_words = set(stopwords.words('english'))
-            words = word_tokenize(self.text_content.lower())
-            filtered_words = [word for word in words if word.isalnum() and word not in stop_words]
-            
-            # Count word frequencies
-            word_freq = Counter(filtered_words)
-            
-            # Get the most common words
-            self.keywords = [word for word, count in word_freq.most_common(top_n)]
-            logger.info(f"Extracted {len(self.keywords)} keywords")
-            return self.keywords
+            stop_words = _english_stopwords()
         except Exception as e:
-            logger.error(f"Error extracting keywords: {str(e)}")
-            # Fallback to simpler method
-            words = self.text_content.lower().split()
-            words = [w for w in words if len(w) > 3]
-            word_freq = Counter(words)
-            self.keywords = [word for word, count in word_freq.most_common(top_n)]
-            logger.info(f"Fallback: Basic keyword extraction, found {len(self.keywords)} keywords")
+            logger.error(f"Error loading stopwords: {str(e)}")
+            stop_words = None
+            
+        # Reuse keywords already extracted from this text
+        cache_key = self._cache_key("keywords", top_n, "stopwords" if stop_words is not None else "short")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.keywords = cached
             return self.keywords
+            
+        # Tokens of the text, tokenized once and shared with other analyses
+        words = self._ensure_tokens()
+        
+        # Count word frequencies, skipping punctuation and stopwords
+        if stop_words is not None:
+            word_freq = Counter(word for word in words if word.isalnum() and word not in stop_words)
+        else:
+            # Without a stopword list, filter out short words instead
+            word_freq = Counter(word for word in words if word.isalnum() and len(word) > 3)
+        
+        # Get the most common words
+        self.keywords = [word for word, count in word_freq.most_common(top_n)]
+        self.cache.put(cache_key, self.keywords)
+        logger.info(f"Extracted {len(self.keywords)} keywords")
+        return self.keywords
     
     def generate_summary(self, sentences_count=5):
         """Generate a summary using TF-IDF approach."""
+        # Reuse a summary already generated from this text, skipping sentence splitting
+        cache_key = None
+        if self.text_content:
+            cache_key = self._cache_key("summary", sentences_count, "nltk" if self.nltk_available else "basic")
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.summary = cached
+                return self.summary
+                
         if not self.sentences:
             self.preprocess_text()
             if not self.sentences:
                 return ""
                 
         try:
-            # Calculate term frequencies
-            word_freq = defaultdict(int)
-            for sentence in self.sentences:
-                for word in word_tokenize(sentence.lower()):
-                    if word.isalnum():
-                        word_freq[word] += 1
-                        
-            # Calculate sentence scores based on word frequencies
-            sentence_scores = defaultdict(float)
-            for i, sentence in enumerate(self.sentences):
-                for word in word_tokenize(sentence.lower()):
-                    if word.isalnum():
-                        sentence_scores[i] += word_freq[word]
+            # Tokenize each sentence once for both passes below
+            sentence_words = self._ensure_sentence_tokens()
+            sentence_lengths = self._sentence_lengths
+            
+            # Calculate term frequencies, counting words but not punctuation
+            word_freq = Counter()
+            for words in sentence_words:
+                word_freq.update(word for word in words if word.isalnum())
                         
-                # Normalize by sentence length
-                sentence_scores[i] = sentence_scores[i] / max(1, len(word_tokenize(sentence)))
+            # Calculate sentence scores based on word frequencies; punctuation has no frequency,
+            # so it adds nothing to a score. Scores are normalized by sentence length, counted
+            # in tokens of the sentence as written, punctuation included
+            sentence_scores = [
+                sum(map(word_freq.__getitem__, words)) / max(1, length)
+                for words, length in zip(sentence_words, sentence_lengths)
+            ]
                 
-            # Get the top sentences
-            top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)[:sentences_count]
-            top_sentences = sorted(top_sentences, key=lambda x: x[0])  # Sort by original position
+            # Get the top sentences, in their original order
+            top_sentences = heapq.nlargest(sentences_count, range(len(sentence_scores)), key=sentence_scores.__getitem__)
+            top_sentences.sort()
             
             # Create the summary
-            self.summary = " ".join([self.sentences[i] for i, _ in top_sentences])
+            self.summary = " ".join([self.sentences[i] for i in top_sentences])
+            if cache_key:
+                self.cache.put(cache_key, self.summary)
             logger.info(f"Generated summary of {len(top_sentences)} sentences")
             return self.summary
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
             return ""
     
-    def extract_topics(self, max_topics=5):
-        """Extract main topics from the text using simple clustering."""
+    def extract_topics(self, max_topics=5, max_chars=TOPIC_SCAN_CHARS):
+        """Extract main topics from the first max_chars characters (all if None) using simple clustering."""
         if not self.keywords:
             self.extract_keywords(top_n=50)
             
         try:
+            # Topics depend on the keywords they are grouped from as well as the text
+            keywords_digest = hashlib.sha256("\n".join(self.keywords).encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+            cache_key = self._cache_key("topics", max_topics, max_chars, keywords_digest)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.topics = cached
+                return self.topics
+                
+            text_lower = self._ensure_text_lower()
+            window_size = 50  # characters
+            
+            scan_end = len(text_lower) if max_chars is None else min(max_chars, len(text_lower))
+            
+            # Record where each keyword occurs in the scanned text, anywhere a substring
+            # matches, as the co-occurrence regex used to
+            positions = {}
+            for keyword in self.keywords:
+                occurrences = []
+                start = text_lower.find(keyword, 0, scan_end)
+                while start != -1:
+                    occurrences.append(start)
+                    start = text_lower.find(keyword, start + 1, scan_end)
+                positions[keyword] = occurrences
+            
             # Group related keywords
             topics = {}
             used_keywords = set()
@@ -218,12 +488,7 @@ class PDFAnalyzer:
                 for other_keyword in self.keywords:
                     if other_keyword not in used_keywords:
                         # Simple co-occurrence check
-                        window_size = 50  # characters
-                        pattern = r'.{0,%d}%s.{0,%d}%s.{0,%d}' % (
-                            window_size, re.escape(keyword), window_size, 
-                            re.escape(other_keyword), window_size
-                        )
-                        if re.search(pattern, self.text_content.lower()):
+                        if self._keywords_co_occur(text_lower, positions, keyword, other_keyword, window_size):
                             related_words.append(other_keyword)
                             used_keywords.add(other_keyword)
                             
@@ -234,12 +499,26 @@ class PDFAnalyzer:
                     break
                     
             self.topics = topics
+            self.cache.put(cache_key, topics)
             logger.info(f"Extracted {len(topics)} topics")
             return topics
         except Exception as e:
             logger.error(f"Error extracting topics: {str(e)}")
             return {}
     
+    def _keywords_co_occur(self, text, positions, first, second, window_size):
+        """Check whether second follows first within window_size characters on the same line."""
+        second_positions = positions[second]
+        for start in positions[first]:
+            end = start + len(first)
+            # Only the nearest following occurrence can be close enough
+            i = bisect.bisect_left(second_positions, end)
+            if i < len(second_positions):
+                following = second_positions[i]
+                if following - end <= window_size and '\n' not in text[start:following]:
+                    return True
+        return False
+    
     def analyze_sentiment(self):
         """Perform basic sentiment analysis."""
         if not self.text_content:
@@ -247,23 +526,24 @@ class PDFAnalyzer:
             return {"positive": 0, "negative": 0, "neutral": 0}
             
         try:
-            # Basic lexicon-based approach
-            positive_words = {"good", "great", "excellent", "positive", "best", "better", 
-                             "advantage", "benefit", "success", "successful", "improve",
-                             "improved", "improvement", "recommended", "recommend"}
-            negative_words = {"bad", "poor", "negative", "worst", "worse", "disadvantage",
-                             "problem", "issue", "fault", "fail", "failed", "failure",
-                             "difficult", "difficulty", "concern", "concerns"}
-            
-            # Count sentiment words
-            words = word_tokenize(self.text_content.lower())
-            pos_count = sum(1 for word in words if word in positive_words)
-            neg_count = sum(1 for word in words if word in negative_words)
+            # Reuse the sentiment already computed for this text
+            cache_key = self._cache_key("sentiment")
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+                
+            # Count sentiment words among the lowercased tokens shared with other analyses, so
+            # hyphenated words such as "not-bad" stay whole and don't count
+            words = self._ensure_tokens()
+            pos_count = sum(1 for word in words if word in _POSITIVE_WORDS)
+            neg_count = sum(1 for word in words if word in _NEGATIVE_WORDS)
             
             # Calculate percentages
             total_sentiment_words = pos_count + neg_count
             if total_sentiment_words == 0:
-                return {"positive": 0, "negative": 0, "neutral": 100}
+                sentiment = {"positive": 0, "negative": 0, "neutral": 100}
+                self.cache.put(cache_key, sentiment)
+                return sentiment
                 
             pos_percent = (pos_count / total_sentiment_words) * 100
             neg_percent = (neg_count / total_sentiment_words) * 100
@@ -274,6 +554,7 @@ class PDFAnalyzer:
                 "neutral": round(100 - pos_percent - neg_percent, 1)
             }
             
+            self.cache.put(cache_key, sentiment)
             logger.info(f"Sentiment analysis completed: {sentiment}")
             return sentiment
         except Exception as e:
@@ -318,29 +599,31 @@ class PDFAnalyzer:
                 logger.error(f"Error using OpenAI for question answering: {str(e)}")
                 logger.info("Falling back to basic question answering")
         
-        # Basic keyword matching answer
+        # Basic keyword matching answer, splitting sentences only now that they're needed
         try:
+            if not self.sentences:
+                self.preprocess_text()
+                
             question = question.lower()
-            question_words = set(word_tokenize(question)) - set(stopwords.words('english'))
-            
-            # Find sentences with the most question keywords
-            sentence_scores = []
-            for i, sentence in enumerate(self.sentences):
-                sentence_words = set(word_tokenize(sentence.lower()))
-                # Calculate score based on keyword matches
-                score = sum(1 for word in question_words if word in sentence_words)
-                if score > 0:
-                    sentence_scores.append((i, score, sentence))
+            try:
+                stop_words = _english_stopwords()
+            except Exception as e:
+                logger.error(f"Error loading stopwords: {str(e)}")
+                stop_words = frozenset()
+            question_words = set(self._word_tokenize(question)) - stop_words
             
-            # Sort by score and return top matches
-            sentence_scores.sort(key=lambda x: x[1], reverse=True)
+            # Score sentences by how many question tokens they contain, using the index
+            index = self._ensure_sentence_index()
+            sentence_scores = Counter()
+            for word in question_words:
+                sentence_scores.update(index.get(word, ()))
             
             if not sentence_scores:
                 return "I couldn't find information related to that question in the document."
             
-            # Return top 2-3 matching sentences
-            top_matches = sentence_scores[:3]
-            answers = [sentence for _, _, sentence in top_matches]
+            # Return top 2-3 matching sentences, earliest first among equal scores
+            top_matches = heapq.nlargest(3, sentence_scores, key=lambda i: (sentence_scores[i], -i))
+            answers = [self.sentences[i] for i in top_matches]
             return " ".join(answers)
             
         except Exception as e:
@@ -352,9 +635,11 @@ class PDFAnalyzer:
         if not self.text_content:
             return {"error": "No text content has been loaded."}
             
-        # Run all analysis methods if not already done
+        # Split sentences once up front; stages that miss the cache tokenize the text on first use
         if not self.sentences:
             self.preprocess_text()
+        
+        # Run all analysis methods if not already done
         if not self.keywords:
             self.extract_keywords()
         if not self.summary:
@@ -372,7 +657,8 @@ class PDFAnalyzer:
             "sentiment": sentiment,
             "stats": {
                 "sentences": len(self.sentences),
-                "words": len(word_tokenize(self.text_content)),
+                # Tokens of the text as written, punctuation included
+                "words": self._ensure_word_count(),
                 "characters": len(self.text_content)
             }
         }
@@ -3,9 +3,14 @@ PDF Interaction Module - Handles user interaction with PDF content
 """
 
 import os
-import json
+import stat
+import hashlib
+import functools
 import logging
 import re
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
 from pdf_processor import PDFProcessor
 from pdf_analyzer import PDFAnalyzer
 from toc_extractor import TOCExtractor
@@ -15,11 +20,100 @@ from component_extractor import ComponentExtractor
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in component folder names, and whitespace runs
+_UNSAFE_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WS_RE = re.compile(r'\s+')
+
+def _markers_pattern(markers):
+    """Compile marker phrases into one case-insensitive pattern that finds any of them in a single scan."""
+    return re.compile('|'.join(re.escape(marker) for marker in markers), re.IGNORECASE)
+
+# Look for TOC markers in the text
+_TOC_MARKERS_RE = _markers_pattern([
+    'table of contents',
+    'contents',
+    'toc',
+    'chapter',
+    'section'
+])
+
+# Look for Index markers
+_INDEX_MARKERS_RE = _markers_pattern([
+    'index',
+    'subject index',
+    'keyword index',
+    'alphabetical index'
+])
+
+# Look for Component List markers
+_COMPONENT_MARKERS_RE = _markers_pattern([
+    'course file',
+    'checklist',
+    'components',
+    'inventory',
+    'file index'
+])
+
+# Maximum number of actions kept in the interaction history
+HISTORY_SIZE = 500
+
+# Maximum number of parsed PDFs kept in memory, keyed by content digest
+PDF_CACHE_SIZE = 32
+
+# Parsed PDF state shared by all PDFInteraction instances, least recently used first
+_parsed_pdfs = OrderedDict()
+_parsed_pdfs_lock = threading.Lock()
+
+def _has_little_text(text, min_chars=50):
+    """Return whether a page has fewer than min_chars characters once stripped."""
+    if len(text) < min_chars:
+        return True
+    # Text without surrounding whitespace is already stripped, so skip the copy
+    if not text[0].isspace() and not text[-1].isspace():
+        return False
+    return len(text.strip()) < min_chars
+
+def _file_digest(path, chunk_size=1 << 16):
+    """Return a BLAKE2b digest of a file's contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+@functools.lru_cache(maxsize=PDF_CACHE_SIZE)
+def _stat_digest(path, mtime_ns, size):
+    """Return the content digest of a file, re-reading it only when its mtime or size changes."""
+    return _file_digest(path)
+
+def _index_components(components):
+    """Index component structures by number, keeping the first component for each number."""
+    by_number = {}
+    for comp in components:
+        by_number.setdefault(str(comp.get('number', '')), comp)
+    return by_number
+
+def _get_parsed_pdf(digest):
+    """Return the cached state of a parsed PDF, or None."""
+    with _parsed_pdfs_lock:
+        parsed = _parsed_pdfs.get(digest)
+        if parsed is not None:
+            _parsed_pdfs.move_to_end(digest)
+        return parsed
+
+def _put_parsed_pdf(digest, parsed):
+    """Cache the state of a parsed PDF, evicting the least recently used ones."""
+    with _parsed_pdfs_lock:
+        _parsed_pdfs[digest] = parsed
+        _parsed_pdfs.move_to_end(digest)
+        while len(_parsed_pdfs) > PDF_CACHE_SIZE:
+            _parsed_pdfs.popitem(last=False)
+
 class PDFInteraction:
-    def __init__(self):
-        """Initialize the PDF interaction system."""
-        self.processor = PDFProcessor()
-        self.analyzer = PDFAnalyzer()
+    def __init__(self, disk_cache=True):
+        """Initialize the PDF interaction system, caching OCR text and analysis results on disk if disk_cache is set."""
+        self.processor = PDFProcessor(ocr_cache=None if disk_cache else False)
+        self.analyzer = PDFAnalyzer(cache=None if disk_cache else False)
         self.toc_extractor = TOCExtractor()
         self.component_extractor = ComponentExtractor()
         self.pdf_path = None
@@ -27,10 +121,15 @@ class PDFInteraction:
         self.analyzed = False
         self.toc_extracted = False
         self.components_extracted = False
-        self.history = []
+        self.history = deque(maxlen=HISTORY_SIZE)  # Oldest actions drop off once full
         self.index_detected = False
         self.toc_detected = False
         self.components_detected = False
+        self.pdf_digest = None
+        self._current_file = None  # (path, mtime, size) of the PDF loaded from disk
+        self._current_result = None
+        self._all_text_cache = None  # Full text of the processed PDF, joined once
+        self._pdf_size = None  # Size in bytes of the loaded PDF
         
     def load_pdf(self, pdf_path):
         """Load a PDF for processing and analysis."""
@@ -38,68 +137,36 @@ class PDFInteraction:
             # Convert to absolute path and normalize
             pdf_path = os.path.abspath(pdf_path)
             
-            # Check if file exists
-            if not os.path.exists(pdf_path):
+            # Check if file exists, with a single stat reused by the checks below
+            try:
+                st = os.stat(pdf_path)
+            except (FileNotFoundError, NotADirectoryError):
                 return {"status": "error", "message": f"File not found: {pdf_path}"}
             
             # Check if it's a file (not a directory)
-            if not os.path.isfile(pdf_path):
+            if not stat.S_ISREG(st.st_mode):
                 return {"status": "error", "message": f"Path is not a file: {pdf_path}"}
             
             # Check file extension
-            if not pdf_path.lower().endswith('.pdf'):
+            if pdf_path[-4:].lower() != '.pdf':
                 return {"status": "error", "message": "File must be a PDF document"}
             
             # Check read permissions
             if not os.access(pdf_path, os.R_OK):
                 return {"status": "error", "message": f"No read permission for file: {pdf_path}"}
             
-            # Reset state
-            self.pdf_path = pdf_path
-            self.processed = False
-            self.analyzed = False
-            self.toc_extracted = False
-            self.components_extracted = False
-            self.index_detected = False
-            self.toc_detected = False
-            self.components_detected = False
-            
-            # Load the PDF
-            success = self.processor.load_pdf(pdf_path)
-            if not success:
-                return {"status": "error", "message": "Failed to load PDF"}
-                
-            # Add to history
-            self.add_to_history("load", f"Loaded PDF: {os.path.basename(pdf_path)}")
-
-            # Automatically process the PDF after loading
-            process_result = self.process_pdf()
-            
-            if process_result["status"] == "success":
-                # Automatically detect if this is a TOC/index and analyze
-                detection_result = self.detect_pdf_type()
-                
-                # Include detection information in the result
-                load_message = f"PDF loaded: {os.path.basename(pdf_path)}"
-                if self.toc_detected:
-                    load_message += " (Table of Contents detected)"
-                elif self.index_detected:
-                    load_message += " (Index detected)"
-                elif self.components_detected:
-                    load_message += " (Component List detected)"
-                
-                return {
-                    "status": "success", 
-                    "message": load_message,
-                    "auto_processed": True,
-                    "is_toc": self.toc_detected,
-                    "is_index": self.index_detected,
-                    "is_component_list": self.components_detected,
-                    "pages": self.processor.total_pages
-                }
-            else:
-                # Just return success for loading even if processing failed
-                return {"status": "success", "message": f"PDF loaded: {os.path.basename(pdf_path)}"}
+            # Nothing to do if this unchanged file is the one already loaded
+            current_file = (pdf_path, st.st_mtime_ns, st.st_size)
+            if current_file == self._current_file:
+                return dict(self._current_result)
+            
+            # Skip hashing unchanged files that have been loaded before
+            digest = _stat_digest(pdf_path, st.st_mtime_ns, st.st_size)
+            result = self._load(pdf_path, digest, st.st_size)
+            if self.processed:
+                self._current_file = current_file
+                self._current_result = dict(result)
+            return result
                 
         except PermissionError as e:
             logger.error(f"Permission error loading PDF: {str(e)}")
@@ -108,6 +175,113 @@ class PDFInteraction:
             logger.error(f"Error loading PDF: {str(e)}")
             return {"status": "error", "message": f"Error loading PDF: {str(e)}"}
     
+    def _load(self, pdf_path, digest, size):
+        """Load and process a PDF of size bytes, reusing cached state."""
+        # Reset state
+        self.pdf_path = pdf_path
+        self._pdf_size = size
+        self._current_file = None
+        self._current_result = None
+        self._all_text_cache = None
+        self.processed = False
+        self.analyzed = False
+        self.toc_extracted = False
+        self.components_extracted = False
+        self.index_detected = False
+        self.toc_detected = False
+        self.components_detected = False
+        
+        # Skip parsing entirely if this content has been loaded before
+        self.pdf_digest = digest
+        cached = _get_parsed_pdf(self.pdf_digest)
+        if cached is not None:
+            self._restore_cached_state(cached)
+            self.add_to_history("load", f"Loaded PDF from cache: {os.path.basename(pdf_path)}")
+            return self._load_result()
+        
+        # Load the PDF
+        success = self.processor.load_pdf(pdf_path)
+        if not success:
+            return {"status": "error", "message": "Failed to load PDF"}
+            
+        # Add to history
+        self.add_to_history("load", f"Loaded PDF: {os.path.basename(pdf_path)}")
+
+        # Automatically process the PDF after loading
+        process_result = self.process_pdf()
+        
+        if process_result["status"] == "success":
+            # Automatically detect if this is a TOC/index and analyze
+            detection_result = self.detect_pdf_type()
+            
+            # Remember the parsed state for later loads of the same content
+            self._cache_current_state()
+            
+            return self._load_result()
+        else:
+            # Just return success for loading even if processing failed
+            return {"status": "success", "message": f"PDF loaded: {os.path.basename(pdf_path)}"}
+    
+    def _load_result(self):
+        """Build the result of a successful load, including detection information."""
+        load_message = f"PDF loaded: {os.path.basename(self.pdf_path)}"
+        if self.toc_detected:
+            load_message += " (Table of Contents detected)"
+        elif self.index_detected:
+            load_message += " (Index detected)"
+        elif self.components_detected:
+            load_message += " (Component List detected)"
+        
+        return {
+            "status": "success", 
+            "message": load_message,
+            "auto_processed": True,
+            "is_toc": self.toc_detected,
+            "is_index": self.index_detected,
+            "is_component_list": self.components_detected,
+            "pages": self.processor.total_pages
+        }
+    
+    def _cache_current_state(self):
+        """Store the parsed state of the current PDF under its content digest."""
+        _put_parsed_pdf(self.pdf_digest, {
+            "total_pages": self.processor.total_pages,
+            "metadata": self.processor.metadata,
+            "text_content": dict(self.processor.text_content),
+            "textless_pages": frozenset(self.processor.textless_pages),
+            "images": self.processor.images,
+            "toc_detected": self.toc_detected,
+            "index_detected": self.index_detected,
+            "components_detected": self.components_detected,
+            "toc": None,
+            "index": None,
+            "components": None,
+            "components_by_number": None
+        })
+    
+    def _restore_cached_state(self, cached):
+        """Restore a previously parsed PDF instead of parsing it again."""
+        self.processor.pdf_path = self.pdf_path
+        self.processor.total_pages = cached["total_pages"]
+        self.processor.metadata = cached["metadata"]
+        self.processor.text_content = dict(cached["text_content"])
+        self.processor.textless_pages = set(cached["textless_pages"])
+        self.processor.images = cached["images"]
+        self._all_text_cache = self.processor.get_all_text()
+        self.analyzer.set_text(self._all_text_cache)
+        
+        self.processed = True
+        self.toc_extracted = True
+        self.toc_detected = cached["toc_detected"]
+        self.index_detected = cached["index_detected"]
+        self.components_detected = cached["components_detected"]
+    
+    def _all_text(self):
+        """Return the full text of the processed PDF, joining the pages only once."""
+        if self._all_text_cache is None:
+            self._all_text_cache = self.processor.get_all_text()
+        return self._all_text_cache
+        
     def process_pdf(self):
         """Process the loaded PDF for text and images."""
         if not self.pdf_path:
@@ -119,20 +293,19 @@ class PDFInteraction:
             if not text_success:
                 return {"status": "error", "message": "Failed to extract text from PDF"}
                 
-            # Try OCR if some pages have little or no text
-            has_empty_pages = any(len(text.strip()) < 50 for page, text in self.processor.text_content.items())
-            if has_empty_pages:
-                logger.info("Some pages have little text, trying OCR...")
-                self.processor.ocr_pdf()
-                
-            # Extract images if poppler is available
-            if self.processor.poppler_available:
-                self.processor.extract_images()
-            else:
+            # Page images are rendered only when needed, by OCR below or when a page is saved
+            if not self.processor.poppler_available:
                 logger.warning("Skipping image extraction as Poppler is not available")
+                
+            # Try OCR on just the pages that have little or no text, rendering each as it's OCR'd
+            sparse_pages = [page_num for page_num, text in self.processor.iter_page_text() if _has_little_text(text)]
+            if sparse_pages:
+                logger.info(f"{len(sparse_pages)} page(s) have little text, trying OCR...")
+                self.processor.ocr_pdf(pages=sparse_pages)
             
             # Set the full text for analysis
             all_text = self.processor.get_all_text()
+            self._all_text_cache = all_text
             self.analyzer.set_text(all_text)
             
             # Mark as processed
@@ -145,7 +318,7 @@ class PDFInteraction:
                 "status": "success", 
                 "message": "PDF processed successfully",
                 "pages": self.processor.total_pages,
-                "text_extracted": bool(all_text.strip())
+                "text_extracted": bool(all_text) and not all_text.isspace()
             }
         except Exception as e:
             logger.error(f"Error processing PDF: {str(e)}")
@@ -157,56 +330,31 @@ class PDFInteraction:
             return {"status": "error", "message": "PDF not processed yet"}
             
         try:
-            all_text = self.processor.get_all_text()
-            
-            # Check for TOC patterns
-            # Look for TOC markers in the text
-            toc_markers = [
-                'table of contents',
-                'contents',
-                'toc',
-                'chapter',
-                'section'
-            ]
-            
-            # Look for Index markers
-            index_markers = [
-                'index',
-                'subject index',
-                'keyword index',
-                'alphabetical index'
-            ]
-            
-            # Look for Component List markers
-            component_markers = [
-                'course file',
-                'checklist',
-                'components',
-                'inventory',
-                'file index'
-            ]
-            
-            # Check if these markers appear in the first few paragraphs
-            first_500_chars = all_text[:500].lower()
-            
-            is_toc = any(marker in first_500_chars for marker in toc_markers)
-            is_index = any(marker in first_500_chars for marker in index_markers)
-            is_component_list = any(marker in first_500_chars for marker in component_markers)
-            
-            # If not detected in the first characters, try to determine by content patterns
-            if not is_toc and not is_index and not is_component_list:
-                # Extract TOC entries
-                toc_entries = self.toc_extractor.extract_toc_from_text(all_text)
+            all_text = self._all_text()
+            
+            # Check if TOC, Index or Component List markers appear in the first few paragraphs
+            first_500_chars = all_text[:500]
+            
+            # TOC markers take precedence over index markers, and both over component markers
+            is_toc = is_index = is_component_list = False
+            if _TOC_MARKERS_RE.search(first_500_chars):
+                is_toc = True
+            elif _INDEX_MARKERS_RE.search(first_500_chars):
+                is_index = True
+            elif _COMPONENT_MARKERS_RE.search(first_500_chars):
+                is_component_list = True
+            else:
+                # If not detected in the first characters, try to determine by content patterns.
+                # Count TOC and index entries in a single pass, stopping once it's clearly a TOC
+                toc_count, index_count = self.toc_extractor.count_entries(all_text, limit=6)
                 
                 # If we found a significant number of TOC entries, it's likely a TOC
-                if len(toc_entries) > 5:
+                if toc_count > 5:
                     is_toc = True
                     
                 # If not TOC, check for index patterns
-                if not is_toc:
-                    index_entries = self.toc_extractor.extract_toc_from_text(all_text, is_index=True)
-                    if len(index_entries) > 5:
-                        is_index = True
+                if not is_toc and index_count > 5:
+                    is_index = True
                         
                 # If not TOC or index, check for component list patterns
                 if not is_toc and not is_index:
@@ -246,14 +394,16 @@ class PDFInteraction:
             return {"status": "error", "message": "PDF not processed yet"}
             
         try:
-            # Run analysis
-            self.analyzer.preprocess_text()
-            self.analyzer.extract_keywords()
-            summary = self.analyzer.generate_summary()
-            topics = self.analyzer.extract_topics()
-            
-            # Mark as analyzed
-            self.analyzed = True
+            # Run analysis once per loaded PDF
+            if not self.analyzed:
+                self.analyzer.preprocess_text()
+                self.analyzer.extract_keywords()
+                self.analyzer.generate_summary()
+                self.analyzer.extract_topics()
+                
+                # Mark as analyzed
+                self.analyzed = True
+            summary = self.analyzer.summary
             
             # Add to history
             self.add_to_history("analyze", "Analyzed PDF content")
@@ -274,7 +424,16 @@ class PDFInteraction:
             return {"status": "error", "message": "PDF not processed yet"}
             
         try:
-            all_text = self.processor.get_all_text()
+            # Reuse the extraction already done for this PDF content
+            cached = _get_parsed_pdf(self.pdf_digest)
+            if cached is not None and cached["toc"] is not None:
+                toc_entries, result = cached["toc"]
+                self.toc_extractor.toc_entries = toc_entries
+                self.toc_extracted = True
+                self.add_to_history("toc", f"Extracted {len(toc_entries)} TOC entries")
+                return dict(result)
+            
+            all_text = self._all_text()
             
             # Extract TOC using the specialized extractor
             toc_entries = self.toc_extractor.extract_toc_from_text(all_text)
@@ -291,13 +450,18 @@ class PDFInteraction:
             # Get document structure summary
             doc_summary = self.toc_extractor.summarize_document_structure()
             
-            return {
+            result = {
                 "status": "success",
                 "message": f"Extracted {len(toc_entries)} TOC entries",
                 "entries": self.toc_extractor.get_toc_structure(),
                 "display": toc_display,
                 "summary": doc_summary
             }
+            
+            if cached is not None:
+                cached["toc"] = (toc_entries, result)
+            
+            return dict(result)
         except Exception as e:
             logger.error(f"Error extracting TOC: {str(e)}")
             return {"status": "error", "message": f"Error extracting TOC: {str(e)}"}
@@ -308,7 +472,15 @@ class PDFInteraction:
             return {"status": "error", "message": "PDF not processed yet"}
             
         try:
-            all_text = self.processor.get_all_text()
+            # Reuse the extraction already done for this PDF content
+            cached = _get_parsed_pdf(self.pdf_digest)
+            if cached is not None and cached["index"] is not None:
+                index_entries, result = cached["index"]
+                self.toc_extractor.index_entries = index_entries
+                self.add_to_history("index", f"Extracted {len(index_entries)} index entries")
+                return dict(result)
+            
+            all_text = self._all_text()
             
             # Extract index entries
             index_entries = self.toc_extractor.extract_toc_from_text(all_text, is_index=True)
@@ -319,12 +491,17 @@ class PDFInteraction:
             # Format index for display
             index_display = self.toc_extractor.display_index()
             
-            return {
+            result = {
                 "status": "success",
                 "message": f"Extracted {len(index_entries)} index entries",
                 "entries": self.toc_extractor.get_index_structure(),
                 "display": index_display
             }
+            
+            if cached is not None:
+                cached["index"] = (self.toc_extractor.index_entries, result)
+            
+            return dict(result)
         except Exception as e:
             logger.error(f"Error extracting index: {str(e)}")
             return {"status": "error", "message": f"Error extracting index: {str(e)}"}
@@ -338,8 +515,9 @@ class PDFInteraction:
             if not self.analyzed:
                 self.analyze_pdf()
                 
+            # An empty summary after a successful analysis would only be empty again
             summary = self.analyzer.summary
-            if not summary:
+            if not summary and not self.analyzed:
                 summary = self.analyzer.generate_summary()
                 
             # Add to history
@@ -362,8 +540,9 @@ class PDFInteraction:
             if not self.analyzed:
                 self.analyze_pdf()
                 
+            # No topics after a successful analysis would only be none again
             topics = self.analyzer.topics
-            if not topics:
+            if not topics and not self.analyzed:
                 topics = self.analyzer.extract_topics()
                 
             # Add to history
@@ -383,9 +562,6 @@ class PDFInteraction:
             return {"status": "error", "message": "PDF not processed yet"}
             
         try:
-            if not self.analyzer.sentences:
-                self.analyzer.preprocess_text()
-                
             answer = self.analyzer.answer_question(question)
             
             # Add to history
@@ -494,7 +670,7 @@ class PDFInteraction:
                 "filename": os.path.basename(self.pdf_path),
                 "path": self.pdf_path,
                 "pages": self.processor.total_pages,
-                "size": os.path.getsize(self.pdf_path)
+                "size": self._pdf_size
             }
             
             # Add to history
@@ -510,10 +686,8 @@ class PDFInteraction:
     
     def add_to_history(self, action_type, description):
         """Add an action to the history."""
-        import datetime
-        
         entry = {
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": datetime.now().isoformat(),
             "action": action_type,
             "description": description
         }
@@ -522,7 +696,7 @@ class PDFInteraction:
     
     def get_history(self):
         """Get the interaction history."""
-        return {"status": "success", "history": self.history}
+        return {"status": "success", "history": list(self.history)}
     
     def create_component_folders(self):
         """Create folders for each component where teachers can store related PDFs."""
@@ -532,27 +706,29 @@ class PDFInteraction:
         try:
             # Create a base directory for component folders
             base_dir = "course_components"
-            if not os.path.exists(base_dir):
-                os.makedirs(base_dir)
+            os.makedirs(base_dir, exist_ok=True)
                 
             # Create folders for each component
             created_folders = []
             for component in self.component_extractor.components:
                 # Create a safe folder name from the component title
-                folder_name = re.sub(r'[<>:"/\\|?*]', '_', component.title)
-                folder_name = re.sub(r'\s+', '_', folder_name)
+                folder_name = _WS_RE.sub('_', _UNSAFE_CHARS_RE.sub('_', component.title))
                 folder_path = os.path.join(base_dir, f"{component.number}_{folder_name}")
                 
-                if not os.path.exists(folder_path):
-                    os.makedirs(folder_path)
-                    created_folders.append(folder_path)
-                    
-                    # Create a README.txt in each folder with component details
-                    with open(os.path.join(folder_path, "README.txt"), "w", encoding="utf-8") as f:
-                        f.write(f"Component {component.number}: {component.title}\n")
-                        if component.description:
-                            f.write(f"\nDescription: {component.description}\n")
-                        f.write("\nUpload related PDFs for this component in this folder.")
+                # Only folders created now get a README; existing ones are left alone
+                try:
+                    os.mkdir(folder_path)
+                except FileExistsError:
+                    continue
+                created_folders.append(folder_path)
+                
+                # Create a README.txt in each folder with component details, written in one go
+                readme = f"Component {component.number}: {component.title}\n"
+                if component.description:
+                    readme += f"\nDescription: {component.description}\n"
+                readme += "\nUpload related PDFs for this component in this folder."
+                with open(os.path.join(folder_path, "README.txt"), "w", encoding="utf-8") as f:
+                    f.write(readme)
             
             return {
                 "status": "success",
@@ -564,37 +740,45 @@ class PDFInteraction:
             logger.error(f"Error creating component folders: {str(e)}")
             return {"status": "error", "message": f"Error creating folders: {str(e)}"}
     
+    # Command mapping: command -> (method name, ((arg key, default, conversion), ...))
+    _COMMANDS = {
+        "load": ("load_pdf", (("path", None, None),)),
+        "process": ("process_pdf", ()),
+        "analyze": ("analyze_pdf", ()),
+        "toc": ("extract_toc", ()),
+        "index": ("extract_index", ()),
+        "components": ("extract_components", ()),
+        "detect": ("detect_pdf_type", ()),
+        "summary": ("get_pdf_summary", ()),
+        "topics": ("get_pdf_topics", ()),
+        "question": ("answer_question", (("question", None, None),)),
+        "page": ("extract_page_text", (("page", 1, int),)),
+        "image": ("save_page_image", (("page", 1, int), ("output", None, None))),
+        "metadata": ("get_pdf_metadata", ()),
+        "analysis": ("get_full_analysis", ()),
+        "history": ("get_history", ()),
+        "create_folders": ("create_component_folders", ())
+    }
+    
     def process_command(self, command, args=None):
         """Process a user command with arguments."""
         if args is None:
             args = {}
             
-        # Command mapping
-        command_map = {
-            "load": lambda: self.load_pdf(args.get("path")),
-            "process": self.process_pdf,
-            "analyze": self.analyze_pdf,
-            "toc": self.extract_toc,
-            "index": self.extract_index,
-            "components": self.extract_components,
-            "detect": self.detect_pdf_type,
-            "summary": self.get_pdf_summary,
-            "topics": self.get_pdf_topics,
-            "question": lambda: self.answer_question(args.get("question")),
-            "page": lambda: self.extract_page_text(int(args.get("page", 1))),
-            "image": lambda: self.save_page_image(int(args.get("page", 1)), args.get("output")),
-            "metadata": self.get_pdf_metadata,
-            "analysis": self.get_full_analysis,
-            "history": self.get_history,
-            "create_folders": self.create_component_folders
-        }
+        # Look up the method and the arguments it takes
+        entry = self._COMMANDS.get(command)
         
         # Check if command exists
-        if command not in command_map:
+        if entry is None:
             return {"status": "error", "message": f"Unknown command: {command}"}
             
         # Execute the command
-        return command_map[command]()
+        method_name, params = entry
+        call_args = []
+        for key, default, convert in params:
+            value = args.get(key, default)
+            call_args.append(convert(value) if convert else value)
+        return getattr(self, method_name)(*call_args)
     
     def extract_components(self):
         """Extract structured components from the PDF."""
@@ -602,7 +786,17 @@ class PDFInteraction:
             return {"status": "error", "message": "PDF not processed yet"}
             
         try:
-            all_text = self.processor.get_all_text()
+            # Reuse the extraction already done for this PDF content
+            cached = _get_parsed_pdf(self.pdf_digest)
+            if cached is not None and cached["components"] is not None:
+                components, categories, result = cached["components"]
+                self.component_extractor.components = components
+                self.component_extractor.categories = categories
+                self.components_extracted = True
+                self.add_to_history("components", f"Extracted {len(components)} components")
+                return dict(result)
+            
+            all_text = self._all_text()
             
             # Extract components using the specialized extractor
             components = self.component_extractor.extract_components_from_text(all_text)
@@ -622,7 +816,7 @@ class PDFInteraction:
             # Add to history
             self.add_to_history("components", f"Extracted {len(components)} components")
             
-            return {
+            result = {
                 "status": "success",
                 "message": f"Extracted {len(components)} components from PDF",
                 "components": self.component_extractor.get_components_structure(),
@@ -630,6 +824,26 @@ class PDFInteraction:
                 "display": display,
                 "summary": summary
             }
+            
+            if cached is not None:
+                cached["components"] = (components, categories, result)
+            
+            return dict(result)
         except Exception as e:
             logger.error(f"Error extracting components: {str(e)}")
-            return {"status": "error", "message": f"Error extracting components: {str(e)}"} 
\ No newline at end of file
+            return {"status": "error", "message": f"Error extracting components: {str(e)}"}
+    
+    def get_component(self, number):
+        """Return the structure of the extracted component with the given number, or None."""
+        result = self.extract_components()
+        if result["status"] != "success":
+            return None
+            
+        # The index is kept with the rest of this PDF content's cached state
+        cached = _get_parsed_pdf(self.pdf_digest)
+        by_number = cached["components_by_number"] if cached is not None else None
+        if by_number is None:
+            by_number = _index_components(result.get("components", []))
+            if cached is not None:
+                cached["components_by_number"] = by_number
+        return by_number.get(str(number)) 
\ No newline at end of file
@@ -3,74 +3,469 @@ PDF Processor Module - Handles PDF extraction functionality
 """
 
 import os
-import PyPDF2
-import pdfplumber
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
+import re
+import atexit
+import contextlib
+import hashlib
+import functools
+import threading
 import tempfile
 import logging
+import multiprocessing
 import shutil
-import sys
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+# PyPDF2, pdfplumber, pdf2image, pytesseract and PIL are imported where they're
+# used, so commands that never parse or render a PDF don't pay for loading them
+
+# PyMuPDF is much faster at plain text extraction; pdfplumber is the fallback
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# tesserocr calls libtesseract directly, keeping the model loaded between pages;
+# pytesseract, which runs the tesseract program, is the fallback
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
 def is_poppler_installed():
-    """Check if Poppler is installed and accessible."""
-    if os.name == 'nt':  # Windows
-        return shutil.which('pdftoppm') is not None or shutil.which('pdftoppm.exe') is not None
-    else:  # Linux, macOS
-        return shutil.which('pdftoppm') is not None
+    """Check if Poppler is installed and accessible, searching PATH only once."""
+    # On Windows shutil.which also tries the PATHEXT extensions, such as .exe
+    return shutil.which('pdftoppm') is not None
+
+# Minimum number of pages given to each text extraction worker process; PyMuPDF
+# is fast enough per page that only much larger ranges are worth a process
+PAGES_PER_WORKER = 8
+FITZ_PAGES_PER_WORKER = 250
+
+# CPU cores this process keeps busy at most with text extraction worker processes and
+# tesseract, shared by all concurrent requests. Under a multi-worker server, set
+# PDF_PROCESSOR_CPUS to the number of cores each server worker may use
+CPU_BUDGET = int(os.environ.get("PDF_PROCESSOR_CPUS", "0")) or os.cpu_count() or 1
+_cpu_budget = threading.BoundedSemaphore(CPU_BUDGET)
+
+# Number of tesseract processes run at once; each is kept single-threaded,
+# since several single-threaded processes beat one multi-threaded one
+OCR_WORKERS = CPU_BUDGET
+
+@contextlib.contextmanager
+def _cpu_slots(wanted):
+    """Take up to wanted cores from the shared CPU budget without waiting, yielding how many were taken."""
+    taken = 0
+    while taken < wanted and _cpu_budget.acquire(blocking=False):
+        taken += 1
+    try:
+        yield taken
+    finally:
+        for _ in range(taken):
+            _cpu_budget.release()
+
+# The thread limit is given to the tesseract program only, leaving other OpenMP users in
+# this process alone. tesserocr and pytesseract's single-page fallback run with the
+# process environment, so deployments set OMP_THREAD_LIMIT=1 to cover them too
+def _tesseract_env():
+    """Return the environment for tesseract processes, single-threaded unless OMP_THREAD_LIMIT is set."""
+    env = dict(os.environ)
+    env.setdefault("OMP_THREAD_LIMIT", "1")
+    return env
+
+def _tesseract_threads():
+    """Return the number of threads each tesseract process runs."""
+    try:
+        return max(1, int(_tesseract_env()["OMP_THREAD_LIMIT"]))
+    except ValueError:
+        return 1
+
+# Pages are OCR'd at the resolution tesseract's LSTM models are trained on, in
+# grayscale, which has a third of the pixel bytes of RGB and reads just as well
+OCR_RENDER_OPTIONS = {"dpi": 300, "grayscale": True}
+
+# Page images kept or saved for the user are rendered in color at pdf2image's default resolution
+PAGE_IMAGE_OPTIONS = {"dpi": 200}
+
+# Longest side an image is OCR'd at; larger scans are shrunk, since tesseract
+# gains nothing from the extra pixels
+MAX_OCR_IMAGE_SIZE = 3500
+
+# English text with the LSTM engine, treating each page as one uniform block of
+# text, which skips tesseract's full page layout analysis
+OCR_LANG = 'eng'
+OCR_CONFIG = '--oem 1 --psm 6'
+
+# Most pages OCR'd by one tesseract process, which loads its model once per batch;
+# tesseract can hang on much longer image lists
+OCR_BATCH_SIZE = 32
+
+# OCR cleanup patterns: a letter O read between digits, and spaces left at line ends.
+# Line breaks and indentation are kept, since TOC and component parsing rely on them
+_OCR_DIGIT_O_RE = re.compile(r'(?<=\d)[Oo](?=\d)')
+_OCR_TRAILING_SPACE_RE = re.compile(r'[ \t]+$', re.MULTILINE)
+
+# Configs tesserocr can apply directly; any other config goes through the tesseract program
+_TESSEROCR_CONFIG_RE = re.compile(r'--oem (?P<oem>\d) --psm (?P<psm>\d+)')
+
+# Idle tesserocr APIs by config, kept for the life of the process so the model stays
+# loaded between OCR runs. An API is lent to one thread at a time, since it can't be
+# shared between threads, and at most OCR_WORKERS idle ones are kept per config
+_tesserocr_idle = {}
+_tesserocr_failed = set()  # Configs tesserocr couldn't be initialized with
+_tesserocr_lock = threading.Lock()
+
+@contextlib.contextmanager
+def _tesserocr_api(config):
+    """Lend out a tesserocr API for config, or None if the tesseract program must be used."""
+    match = _TESSEROCR_CONFIG_RE.fullmatch(config.strip()) if tesserocr is not None else None
+    if match is None or config in _tesserocr_failed:
+        yield None
+        return
+        
+    with _tesserocr_lock:
+        idle = _tesserocr_idle.get(config)
+        api = idle.pop() if idle else None
+    if api is None:
+        try:
+            api = tesserocr.PyTessBaseAPI(lang=OCR_LANG, oem=int(match['oem']), psm=int(match['psm']))
+        except Exception as e:
+            logger.warning(f"Could not initialize tesserocr, using the tesseract program: {str(e)}")
+            _tesserocr_failed.add(config)
+            yield None
+            return
+            
+    try:
+        yield api
+    finally:
+        with _tesserocr_lock:
+            idle = _tesserocr_idle.setdefault(config, [])
+            if len(idle) < OCR_WORKERS:
+                idle.append(api)
+                api = None
+        if api is not None:
+            api.End()
+
+@atexit.register
+def _end_tesserocr_apis():
+    """Release the idle tesserocr APIs and their loaded models."""
+    with _tesserocr_lock:
+        apis = [api for idle in _tesserocr_idle.values() for api in idle]
+        _tesserocr_idle.clear()
+    for api in apis:
+        try:
+            api.End()
+        except Exception:
+            pass
+
+def _tesserocr_text(api, image):
+    """Perform OCR on an image with a tesserocr API, in the same form the tesseract program outputs."""
+    api.SetImage(image)
+    # The tesseract program ends each page with a form feed; keep cached text consistent
+    return api.GetUTF8Text() + '\f'
+
+def _prepare_ocr_image(image):
+    """Return the image in grayscale and no larger than MAX_OCR_IMAGE_SIZE, leaving the original untouched."""
+    if image.mode != 'L':
+        image = image.convert('L')
+    elif max(image.size) > MAX_OCR_IMAGE_SIZE:
+        image = image.copy()
+    if max(image.size) > MAX_OCR_IMAGE_SIZE:
+        from PIL import Image
+        image.thumbnail((MAX_OCR_IMAGE_SIZE, MAX_OCR_IMAGE_SIZE), Image.LANCZOS)
+    return image
+
+def _clean_ocr_text(text):
+    """Fix common OCR misreads without changing the line layout."""
+    return _OCR_TRAILING_SPACE_RE.sub('', _OCR_DIGIT_O_RE.sub('0', text))
+
+@functools.lru_cache(maxsize=None)
+def _tesseract_version():
+    """Return the versions of tesserocr's libtesseract and the tesseract program, checked once."""
+    versions = []
+    if tesserocr is not None:
+        try:
+            versions.append(tesserocr.tesseract_version())
+        except Exception:
+            versions.append("tesserocr")
+    try:
+        import pytesseract
+        versions.append(str(pytesseract.get_tesseract_version()))
+    except Exception:
+        versions.append("unknown")
+    return "|".join(versions)
+
+# Directory holding cached OCR text, keyed by a digest of the page image, and the most it may hold
+OCR_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdf_processor", "ocr")
+OCR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Part of every OCR cache key; bump it whenever a change to how pages are prepared or
+# read changes the OCR text, so entries written by older code are no longer used
+OCR_CACHE_VERSION = 1
+
+# The cache directory is checked against its size limit after this many writes
+CACHE_PRUNE_INTERVAL = 32
+
+class OCRCache:
+    """Cache of OCR text stored as text files, one per page image and tesseract settings, dropping the least recently used past max_bytes."""
+    def __init__(self, cache_dir=OCR_CACHE_DIR, max_bytes=OCR_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._puts = 0
+        
+    def key(self, image, config):
+        """Return the cache key for OCR of image with the given tesseract config and version."""
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        digest.update(f"v{OCR_CACHE_VERSION}|{_tesseract_version()}|{sorted(OCR_RENDER_OPTIONS.items())}|{MAX_OCR_IMAGE_SIZE}|"
+                      f"{image.mode}|{image.size}|{OCR_LANG}|{config}".encode('utf-8'))
+        return digest.hexdigest()
+        
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+        
+    def get(self, key):
+        """Return the cached OCR text for key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as file:
+                text = file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable OCR cache entry {key}: {str(e)}")
+            return None
+            
+        # Mark the entry as recently used, so pruning removes it last
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+            
+    def put(self, key, text):
+        """Store OCR text under key."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as file:
+                file.write(text)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not cache OCR text {key}: {str(e)}")
+            return
+            
+        self._puts += 1
+        if self._puts % CACHE_PRUNE_INTERVAL == 1:
+            self.prune()
+            
+    def prune(self):
+        """Remove the least recently used entries until the cache holds at most max_bytes."""
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith('.txt'):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+                        
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        except OSError as e:
+            logger.warning(f"Could not prune the OCR cache: {str(e)}")
+
+class _NoCache:
+    """Stand-in for OCRCache that stores nothing."""
+    def key(self, image, config):
+        return None
+        
+    def get(self, key):
+        return None
+        
+    def put(self, key, text):
+        pass
+
+def _page_may_have_text(page):
+    """Return False only for pages whose resources can't show text, such as bare scans."""
+    try:
+        resources = page.get('/Resources')
+        if resources is None:
+            return True
+        resources = resources.get_object()
+        
+        # Showing text needs a font, either on the page or inside a form XObject
+        if '/Font' in resources:
+            return True
+        xobjects = resources.get('/XObject')
+        if xobjects is not None:
+            for xobject in xobjects.get_object().values():
+                if xobject.get_object().get('/Subtype') == '/Form':
+                    return True
+        return False
+    except Exception:
+        return True
+
+def _textless_pages(reader):
+    """Return the numbers of the pages that can't contain extractable text."""
+    return {i + 1 for i, page in enumerate(reader.pages) if not _page_may_have_text(page)}
+
+def _fitz_textless_pages(doc):
+    """Return the numbers of the pages of a PyMuPDF document that use no fonts."""
+    textless = set()
+    for i in range(doc.page_count):
+        try:
+            # Fonts used inside form XObjects are listed with the page's own
+            if not doc.get_page_fonts(i):
+                textless.add(i + 1)
+        except Exception:
+            continue
+    return textless
+
+def _fitz_metadata(doc):
+    """Return a PyMuPDF document's metadata with the same keys PyPDF2 uses, e.g. '/Title'."""
+    return {'/' + key[0].upper() + key[1:]: value
+            for key, value in (doc.metadata or {}).items()
+            if value and key not in ('format', 'encryption')}
+
+def _extract_page_range(pdf_path, start, stop, skip=frozenset()):
+    """Extract the text of pages start..stop-1 in a worker process, leaving page numbers in skip empty."""
+    if fitz is not None:
+        with fitz.open(pdf_path) as doc:
+            return ["" if i + 1 in skip else doc[i].get_text() for i in range(start, stop)]
+            
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return ["" if i + 1 in skip else pdf.pages[i].extract_text() or "" for i in range(start, stop)]
 
 class PDFProcessor:
-    def __init__(self, pdf_path=None):
-        """Initialize the PDF processor with an optional path to a PDF."""
+    def __init__(self, pdf_path=None, ocr_cache=None):
+        """Initialize the PDF processor with an optional path to a PDF and OCR cache, or ocr_cache=False for none."""
         self.pdf_path = pdf_path
+        if ocr_cache is None:
+            ocr_cache = OCRCache()
+        elif ocr_cache is False:
+            ocr_cache = _NoCache()
+        self.ocr_cache = ocr_cache
         self.text_content = {}
         self.images = []
         self.metadata = {}
         self.total_pages = 0
+        self.textless_pages = set()  # Pages with no fonts, e.g. scans, which only OCR can read
         self.poppler_available = is_poppler_installed()
         
         if not self.poppler_available:
             logger.warning("Poppler is not installed or not in PATH. Image extraction will be limited.")
             logger.info("Install Poppler: https://github.com/oschwartz10612/poppler-windows/releases/ (Windows)")
             logger.info("Or use: brew install poppler (macOS) or apt-get install poppler-utils (Linux)")
+            
+        logger.debug(f"OCR runs {OCR_WORKERS} tesseract worker(s), OMP_THREAD_LIMIT={_tesseract_env()['OMP_THREAD_LIMIT']}")
+        
+    def _read_document_info(self, pdf_path):
+        """Read the page count, metadata and textless pages of a PDF."""
+        if fitz is not None:
+            # PyMuPDF reads these without parsing every page object, unlike PyPDF2
+            with fitz.open(pdf_path, filetype='pdf') as doc:
+                self.total_pages = doc.page_count
+                self.metadata = _fitz_metadata(doc)
+                self.textless_pages = _fitz_textless_pages(doc)
+            return
+            
+        import PyPDF2
+        with open(pdf_path, 'rb') as file:
+            self._read_reader_info(PyPDF2.PdfReader(file))
+                
+    def _read_reader_info(self, reader):
+        """Read the page count, metadata and textless pages from a PyPDF2 reader."""
+        self.total_pages = len(reader.pages)
+        # Copy the metadata into a plain dict while the file is still open; indexing
+        # resolves indirect values, which PyPDF2 would otherwise read from the file later
+        metadata = reader.metadata
+        self.metadata = {str(key): str(metadata[key]) for key in metadata} if metadata else {}
+        self.textless_pages = _textless_pages(reader)
         
     def load_pdf(self, pdf_path):
         """Load a PDF from the given path."""
         try:
             self.pdf_path = pdf_path
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                self.total_pages = len(reader.pages)
-                self.metadata = reader.metadata if reader.metadata else {}
+            self._read_document_info(pdf_path)
             logger.info(f"Loaded PDF: {pdf_path} with {self.total_pages} pages")
             return True
         except Exception as e:
             logger.error(f"Error loading PDF: {str(e)}")
             return False
     
-    def extract_text(self):
-        """Extract text from all pages of the PDF using pdfplumber."""
+    def extract_text(self, max_pages=None):
+        """Extract text from the pages of the PDF, optionally only the first max_pages."""
         if not self.pdf_path:
             logger.error("No PDF loaded")
             return False
         
         try:
             self.text_content = {}
-            with pdfplumber.open(self.pdf_path) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    page_text = page.extract_text() or ""
-                    self.text_content[i+1] = page_text
+            
+            # Extraction holds the GIL, so large PDFs are split across processes, as many
+            # as the shared CPU budget has room for; otherwise this thread extracts them all
+            page_count = self.total_pages if max_pages is None else min(self.total_pages, max_pages)
+            pages_per_worker = FITZ_PAGES_PER_WORKER if fitz is not None else PAGES_PER_WORKER
+            wanted = min(CPU_BUDGET, page_count // pages_per_worker)
+            with _cpu_slots(wanted if wanted > 1 else 0) as workers:
+                if workers > 1:
+                    self._extract_text_parallel(page_count, workers)
+                elif fitz is not None:
+                    with fitz.open(self.pdf_path) as doc:
+                        page_count = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+                        for i in range(page_count):
+                            # Pages without fonts are left for OCR
+                            if i + 1 in self.textless_pages:
+                                self.text_content[i+1] = ""
+                            else:
+                                self.text_content[i+1] = doc[i].get_text()
+                else:
+                    import pdfplumber
+                    with pdfplumber.open(self.pdf_path) as pdf:
+                        for i, page in enumerate(pdf.pages[:max_pages]):
+                            # Pages without fonts are left for OCR
+                            if i + 1 in self.textless_pages:
+                                self.text_content[i+1] = ""
+                                continue
+                            page_text = page.extract_text() or ""
+                            self.text_content[i+1] = page_text
             logger.info(f"Extracted text from {len(self.text_content)} pages")
             return True
         except Exception as e:
             logger.error(f"Error extracting text: {str(e)}")
             return False
     
+    def _extract_text_parallel(self, page_count, workers):
+        """Extract text from contiguous page ranges in separate processes."""
+        chunk = -(-page_count // workers)  # Ceiling division
+        starts = range(0, page_count, chunk)
+        stops = [min(start + chunk, page_count) for start in starts]
+        
+        # Workers are spawned rather than forked, since forking a process with other threads
+        # running, such as a threaded server worker, can leave a lock held in the child
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = executor.map(_extract_page_range, repeat(self.pdf_path), starts, stops, repeat(self.textless_pages))
+            for start, page_texts in zip(starts, results):
+                for offset, page_text in enumerate(page_texts):
+                    self.text_content[start + offset + 1] = page_text
+    
     def extract_images(self):
         """Extract images from the PDF using pdf2image."""
         if not self.pdf_path:
@@ -83,8 +478,11 @@ class PDFProcessor:
             return False
         
         try:
-            # Convert PDF pages to images
-            images = convert_from_path(self.pdf_path)
+            from pdf2image import convert_from_path
+            
+            # Convert PDF pages to images, with as many poppler processes as the CPU budget allows
+            with _cpu_slots(OCR_WORKERS) as slots:
+                images = convert_from_path(self.pdf_path, thread_count=max(1, slots), **PAGE_IMAGE_OPTIONS)
             self.images = images
             logger.info(f"Extracted {len(images)} image(s) from PDF")
             return True
@@ -93,39 +491,215 @@ class PDFProcessor:
             self.images = []  # Reset on failure
             return False
     
-    def ocr_image(self, image):
-        """Perform OCR on a single image to extract text."""
+    def _render_page(self, page_num, options=OCR_RENDER_OPTIONS):
+        """Rasterize a single page with the given pdf2image options, returning None if it can't be rendered."""
+        if not self.poppler_available:
+            return None
+            
+        try:
+            from pdf2image import convert_from_path
+            images = convert_from_path(self.pdf_path, first_page=page_num, last_page=page_num, **options)
+            return images[0] if images else None
+        except Exception as e:
+            logger.error(f"Error rendering page {page_num}: {str(e)}")
+            return None
+    
+    def _page_image(self, page_num):
+        """Return a page's image from memory, or render just that page."""
+        if page_num <= len(self.images):
+            return self.images[page_num-1]
+        return self._render_page(page_num)
+    
+    def _render_pages_to_files(self, page_nums, output_folder):
+        """Rasterize pages into output_folder with one poppler run per range of consecutive pages, returning their paths by page."""
+        paths = {}
+        if not self.poppler_available:
+            return paths
+            
+        # Group consecutive pages so poppler opens the PDF once per range instead of once per page
+        ranges = []
+        for page_num in sorted(page_nums):
+            if ranges and page_num == ranges[-1][1] + 1:
+                ranges[-1][1] = page_num
+            else:
+                ranges.append([page_num, page_num])
+                
+        from pdf2image import convert_from_path
+        for first, last in ranges:
+            options = dict(first_page=first, last_page=last, output_folder=output_folder,
+                           output_file=f"p{first}_", paths_only=True, fmt='png', **OCR_RENDER_OPTIONS)
+            try:
+                range_paths = convert_from_path(self.pdf_path, **options)
+            except Exception as e:
+                logger.warning(f"Error rendering pages {first}-{last}: {str(e)}")
+                continue
+            # Pages left out here are rendered one at a time later
+            if len(range_paths) == last - first + 1:
+                paths.update(zip(range(first, last + 1), range_paths))
+        return paths
+        
+    def _ocr_batch(self, page_nums, scratch_dir, config=OCR_CONFIG):
+        """Perform OCR on several pages with a single tesseract process, using scratch_dir for image files, and return their texts in order."""
+        import pytesseract
+        from PIL import Image
+        
+        texts = {}
+        image_paths = set()  # Files this batch wrote to the shared scratch directory
+        with _tesserocr_api(config) as api:
+            try:
+                # Pages not in memory are rendered straight to files, which are loaded one at a time
+                rendered = self._render_pages_to_files([page_num for page_num in page_nums if page_num > len(self.images)], scratch_dir)
+                image_paths.update(rendered.values())
+            
+                # Pages already in the cache skip tesseract; the rest are written out as images
+                pending = []  # (page_num, cache_key, image_path)
+                for page_num in page_nums:
+                    rendered_path = rendered.get(page_num)
+                    if rendered_path is not None:
+                        source = Image.open(rendered_path)
+                        source.load()
+                    else:
+                        source = self._page_image(page_num)
+                    if source is None:
+                        texts[page_num] = ""
+                        continue
+                    image = _prepare_ocr_image(source)
+                    cache_key = self.ocr_cache.key(image, config)
+                    text = self.ocr_cache.get(cache_key)
+                    if text is not None:
+                        texts[page_num] = text
+                        continue
+                    
+                    # With tesserocr the loaded model is reused directly, with no image files
+                    if api is not None:
+                        try:
+                            text = _tesserocr_text(api, image)
+                        except Exception as e:
+                            logger.error(f"OCR error on page {page_num}: {str(e)}")
+                            texts[page_num] = ""
+                            continue
+                        self.ocr_cache.put(cache_key, text)
+                        texts[page_num] = text
+                        continue
+                    
+                    # Save right away so only one rendered bitmap is held at a time,
+                    # reusing the rendered file when the image didn't need any changes
+                    if rendered_path is not None and image is source:
+                        image_path = rendered_path
+                    else:
+                        image_path = os.path.join(scratch_dir, f"page_{page_num}.png")
+                        image_paths.add(image_path)
+                        image.save(image_path)
+                    pending.append((page_num, cache_key, image_path))
+                
+                if pending:
+                    outputs = self._run_tesseract_batch(scratch_dir, [image_path for _, _, image_path in pending], config)
+                    for i, (page_num, cache_key, image_path) in enumerate(pending):
+                        if outputs is not None:
+                            text = outputs[i]
+                        else:
+                            try:
+                                text = pytesseract.image_to_string(image_path, lang=OCR_LANG, config=config)
+                            except Exception as e:
+                                logger.error(f"OCR error on page {page_num}: {str(e)}")
+                                texts[page_num] = ""
+                                continue
+                        self.ocr_cache.put(cache_key, text)
+                        texts[page_num] = text
+            finally:
+                # Remove this batch's images so the scratch directory doesn't grow with the page count
+                for image_path in image_paths:
+                    try:
+                        os.remove(image_path)
+                    except OSError:
+                        pass
+                        
+        return [_clean_ocr_text(texts[page_num]) for page_num in page_nums]
+    
+    def _run_tesseract_batch(self, scratch_dir, image_paths, config):
+        """Run tesseract once over a list of images, returning one text per image or None on failure."""
+        import pytesseract
+        
+        # Batches share the scratch directory, so each thread writes its own list file
+        list_path = os.path.join(scratch_dir, f"pages_{threading.get_ident()}.txt")
+        with open(list_path, 'w', encoding='utf-8') as file:
+            file.write("\n".join(image_paths) + "\n")
+            
+        command = [pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout', '-l', OCR_LANG] + config.split()
+        try:
+            result = subprocess.run(command, capture_output=True, check=True, env=_tesseract_env())
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Batch OCR failed, falling back to one page at a time: {str(e)}")
+            return None
+            
+        # Tesseract ends the text of every page with a form feed
+        pages = result.stdout.decode('utf-8', errors='replace').split('\f')[:-1]
+        if len(pages) != len(image_paths):
+            logger.warning(f"Batch OCR returned {len(pages)} pages for {len(image_paths)} images, falling back to one page at a time")
+            return None
+        return [page + '\f' for page in pages]
+    
+    def ocr_image(self, image, config=OCR_CONFIG):
+        """Perform OCR on a single image to extract text, passing config to tesseract."""
         try:
-            text = pytesseract.image_to_string(image)
-            return text
+            image = _prepare_ocr_image(image)
+            # Hashing the bitmap is far cheaper than running tesseract on it again
+            cache_key = self.ocr_cache.key(image, config)
+            text = self.ocr_cache.get(cache_key)
+            if text is None:
+                with _tesserocr_api(config) as api:
+                    if api is not None:
+                        text = _tesserocr_text(api, image)
+                    else:
+                        import pytesseract
+                        text = pytesseract.image_to_string(image, lang=OCR_LANG, config=config)
+                self.ocr_cache.put(cache_key, text)
+            return _clean_ocr_text(text)
         except Exception as e:
             logger.error(f"OCR error: {str(e)}")
             return ""
     
-    def ocr_pdf(self):
-        """Run OCR on all pages of the PDF and update text content."""
+    def ocr_pdf(self, pages=None, config=OCR_CONFIG):
+        """Run OCR on the given page numbers (all short pages if None) with the tesseract config and update text content."""
         if not self.pdf_path:
             logger.error("No PDF loaded")
             return False
             
+        if not self.images and not self.poppler_available:
+            logger.warning("OCR requires Poppler to render pages. Please install it and add to PATH.")
+            return False
+            
         try:
-            # Extract images if not already done
-            if not self.images:
-                self.extract_images()
-                
-            # Perform OCR on each image
-            for i, image in enumerate(self.images):
-                # If the page already has text, check if OCR provides more content
-                page_num = i + 1
-                existing_text = self.text_content.get(page_num, "")
-                
+            # Pages without an image in memory are rendered as their batch is OCR'd
+            page_count = self.total_pages
+            
+            if pages is not None:
+                # OCR just the pages the caller picked
+                pending = [page_num for page_num in pages if 1 <= page_num <= page_count]
+            else:
                 # If existing text is short or empty, use OCR
-                if len(existing_text) < 100:
-                    ocr_text = self.ocr_image(image)
-                    
-                    # If OCR found more text, use it
-                    if len(ocr_text) > len(existing_text):
-                        self.text_content[page_num] = ocr_text
+                pending = [
+                    page_num for page_num in range(1, page_count + 1)
+                    if len(self.text_content.get(page_num, "")) < 100
+                ]
+            
+            # Each batch of pages is OCR'd by its own tesseract process, so threads run them in parallel
+            if pending:
+                batch_size = min(OCR_BATCH_SIZE, -(-len(pending) // OCR_WORKERS))  # Ceiling division
+                batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+                # Each tesseract process takes its threads' worth of the shared CPU budget;
+                # with no room left the batches run one at a time
+                threads = _tesseract_threads()
+                # One scratch directory serves every batch of this run, rather than one per batch
+                with _cpu_slots(min(OCR_WORKERS, len(batches)) * threads) as slots, \
+                        tempfile.TemporaryDirectory(prefix="pdfproc_") as scratch_dir, \
+                        ThreadPoolExecutor(max_workers=max(1, slots // threads)) as executor:
+                    results = executor.map(self._ocr_batch, batches, repeat(scratch_dir), repeat(config))
+                    for batch, ocr_texts in zip(batches, results):
+                        for page_num, ocr_text in zip(batch, ocr_texts):
+                            # If OCR found more text, use it
+                            if len(ocr_text) > len(self.text_content.get(page_num, "")):
+                                self.text_content[page_num] = ocr_text
                         
             logger.info("Completed OCR on PDF pages")
             return True
@@ -137,24 +711,37 @@ class PDFProcessor:
         """Get the text content of a specific page."""
         return self.text_content.get(page_num, "")
     
+    def iter_page_text(self):
+        """Yield (page_num, text) for each extracted page in page order, without copying."""
+        for page_num in sorted(self.text_content):
+            yield page_num, self.text_content[page_num]
+    
     def get_all_text(self):
         """Get the text content of the entire PDF as a single string."""
         if not self.text_content:
             return ""
         
-        all_text = ""
-        for page in range(1, self.total_pages + 1):
-            all_text += self.text_content.get(page, "") + "\n\n"
-        return all_text
+        # Every page, including the last, is followed by a blank line
+        pages = [self.text_content.get(page, "") for page in range(1, self.total_pages + 1)]
+        pages.append("")
+        return "\n\n".join(pages)
     
     def save_image(self, page_num, output_path):
         """Save a specific page as an image."""
-        if not self.images or page_num > len(self.images):
+        if 1 <= page_num <= len(self.images):
+            image = self.images[page_num-1]
+        elif 1 <= page_num <= self.total_pages:
+            # Pages are only kept in memory after extract_images, so render just this one
+            image = self._render_page(page_num, PAGE_IMAGE_OPTIONS)
+        else:
+            image = None
+            
+        if image is None:
             logger.error(f"Page {page_num} not available")
             return False
             
         try:
-            self.images[page_num-1].save(output_path)
+            image.save(output_path)
             logger.info(f"Saved page {page_num} as image to {output_path}")
             return True
         except Exception as e:
@@ -0,0 +1,17 @@
+"""
+Modules as they were before the performance work, kept to check that rewritten
+code still gives the same results. Load them with load() rather than importing,
+so they don't shadow the current modules of the same name.
+"""
+
+import importlib.util
+import os
+
+BASELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load(name):
+    """Import the baseline copy of module name under the name baseline_<name>."""
+    spec = importlib.util.spec_from_file_location(f"baseline_{name}", os.path.join(BASELINE_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
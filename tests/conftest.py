@@ -0,0 +1,8 @@
+import logging
+import os
+import sys
+
+# Tests import the modules from the repository root, as the app does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.CRITICAL)
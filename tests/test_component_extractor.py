@@ -0,0 +1,67 @@
+"""
+Tests for component_extractor, checked against the baseline module.
+"""
+
+import random
+
+from component_extractor import ComponentExtractor
+from baseline import load
+
+baseline = load("component_extractor")
+
+COURSE_FILE = """COURSE FILE INDEX
+Contents No
+1. Vision and Mission of the University and Department
+2.
+Faculty profiles and individual timetables
+3) Course handout and closure report
+4. (section wise)
+5. Mid Term Exam (MTE) question papers with CO mapping and solutions
+6: Assignment questions with solution
+7 - Mid Term Exam question paper
+a) Faculty profiles and individual timetables
+ii. Course handout
+    9. Student name lists
+10 teaching plan
+ASSESSMENT DETAILS
+16. Quiz -- ; : marks
+17. Final exam
+I. GENERAL INFORMATION
+18. Something
+COURSE INFORMATION: extra
+iv) roman item
+1.5 decimal
+99
+"""
+
+# Words that random component lists are built from, covering each numbering style and category heading
+WORDS = ("alpha beta gamma delta 1. 2) 3: 4 - a) ii. IV) Chapter Section Part ... , 10 15-17 "
+         "see also (x) teaching is are ASSESSMENT DETAILS COURSE INFORMATION").split()
+
+def outputs(extractor, text):
+    extractor.extract_components_from_text(text)
+    extractor.organize_by_categories()
+    return (extractor.get_components_structure(), extractor.get_categories_structure(),
+            extractor.display_components(), extractor.summarize_components(),
+            [component.raw_text for component in extractor.components])
+
+def test_course_file_matches_baseline():
+    assert outputs(ComponentExtractor(), COURSE_FILE) == outputs(baseline.ComponentExtractor(), COURSE_FILE)
+
+def test_random_lists_match_baseline():
+    rng = random.Random(7)
+    for _ in range(300):
+        lines = []
+        for _ in range(rng.randint(1, 60)):
+            indent = ' ' * rng.choice([0, 0, 0, 2, 4])
+            lines.append(indent + ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 8))))
+        text = '\n'.join(lines)
+        assert outputs(ComponentExtractor(), text) == outputs(baseline.ComponentExtractor(), text), repr(text)
+
+def test_extractor_reuse_matches_baseline():
+    # A second text on the same extractor must not see the first one's components
+    current, original = ComponentExtractor(), baseline.ComponentExtractor()
+    outputs(current, COURSE_FILE)
+    outputs(original, COURSE_FILE)
+    text = "1. Only entry here\n2. And another"
+    assert outputs(current, text) == outputs(original, text)
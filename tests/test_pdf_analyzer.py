@@ -0,0 +1,144 @@
+"""
+Tests for pdf_analyzer: analysis results checked against the baseline module,
+and the on-disk analysis cache.
+
+NLTK's Punkt model and stopword corpus are downloads, so the tests use an
+untrained Punkt tokenizer and the bundled stopword list for both modules.
+"""
+
+import os
+import random
+import types
+
+import pytest
+
+nltk = pytest.importorskip("nltk")
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+import pdf_analyzer
+from pdf_analyzer import AnalysisCache, PDFAnalyzer
+from baseline import load
+
+# Words that random documents are built from, with the punctuation, contractions,
+# abbreviations and hyphenated sentiment words that tokenizing has to agree on
+VOCAB = ("data base database well-known don't can't 3.14 e.g. Dr. Smith's good bad problem "
+         "analysis result results method (see) [1] \"quoted\" U.S. it's 2nd co-op x-ray A. B. "
+         "the of and a to system systems model good-looking not-bad GOOD Bad Problem's "
+         "I'M DON'T Can't Mr. etc. ... -- O'Neil").split()
+
+def random_document(rng):
+    parts = []
+    for _ in range(rng.randint(1, 40)):
+        sentence = ' '.join(rng.choices(VOCAB, k=rng.randint(1, 15)))
+        parts.append(sentence[0].upper() + sentence[1:] + rng.choice(['.', '!', '?', '.', ',', '']))
+        parts.append(rng.choice([' ', ' ', '\n', '  ']))
+    return ''.join(parts)
+
+@pytest.fixture(scope="module")
+def baseline():
+    """The baseline analyzer module, with NLTK's downloads replaced by local stand-ins for both modules."""
+    punkt = PunktSentenceTokenizer()
+    real_load = nltk.data.load
+    def load_resource(resource, *args, **kwargs):
+        if 'punkt' in resource:
+            return punkt
+        return real_load(resource, *args, **kwargs)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(nltk, "download", lambda *args, **kwargs: False)
+        mp.setattr(nltk.data, "find", lambda *args, **kwargs: os.devnull)
+        mp.setattr(nltk.data, "load", load_resource)
+        mp.setattr(nltk.tokenize, "load", load_resource)
+        mp.setattr(PDFAnalyzer, "_nltk_checked", False)
+        pdf_analyzer._sentence_tokenizer.cache_clear()
+
+        module = load("pdf_analyzer")
+        stop_words = sorted(pdf_analyzer._english_stopwords())
+        module.stopwords = types.SimpleNamespace(words=lambda language: list(stop_words))
+        yield module
+
+    pdf_analyzer._sentence_tokenizer.cache_clear()
+
+def analyzers(baseline, text, cache=False):
+    original = baseline.PDFAnalyzer(text)
+    current = PDFAnalyzer(text, cache=cache)
+    original.use_openai = current.use_openai = False
+    return original, current
+
+def test_analyses_match_baseline(baseline):
+    rng = random.Random(1)
+    for _ in range(150):
+        text = random_document(rng)
+        original, current = analyzers(baseline, text)
+        original.preprocess_text()
+        current.preprocess_text()
+        assert current.sentences == original.sentences
+        assert current.extract_keywords() == original.extract_keywords(), repr(text)
+
+        # Topics are grouped from the top 50 keywords; the baseline scanned the whole text
+        original.keywords = []
+        current.keywords = []
+        assert current.extract_topics(max_chars=None) == original.extract_topics(), repr(text)
+
+        assert current.generate_summary() == original.generate_summary(), repr(text)
+        assert current.analyze_sentiment() == original.analyze_sentiment(), repr(text)
+        question = ' '.join(rng.choices(VOCAB, k=3)) + '?'
+        assert current.answer_question(question) == original.answer_question(question), repr((text, question))
+
+def test_analysis_results_match_baseline(baseline):
+    rng = random.Random(2)
+    for _ in range(100):
+        text = random_document(rng)
+        original, current = analyzers(baseline, text)
+        current_results = current.get_analysis_results()
+        original_results = original.get_analysis_results()
+        # The baseline's topics are compared above; its results scan the whole text for them
+        del current_results["topics"], original_results["topics"]
+        assert current_results == original_results, repr(text)
+
+def test_sentiment_ignores_hyphenated_words(baseline):
+    text = "A good-looking design. The results were not-bad. A good method, with one problem."
+    original, current = analyzers(baseline, text)
+    assert current.analyze_sentiment() == original.analyze_sentiment() == {"positive": 50.0, "negative": 50.0, "neutral": 0.0}
+
+def test_cached_results_skip_tokenizing(baseline, tmp_path, monkeypatch):
+    text = random_document(random.Random(3))
+    _, first = analyzers(baseline, text, cache=AnalysisCache(str(tmp_path)))
+    results = first.get_analysis_results()
+
+    # A second analyzer of the same text finds every result, word count included, in the cache
+    _, second = analyzers(baseline, text, cache=AnalysisCache(str(tmp_path)))
+    def fail(text):
+        raise AssertionError("tokenized despite a full cache hit")
+    monkeypatch.setattr(second, "_word_tokenize", fail)
+    assert second.get_analysis_results() == results
+
+def test_cache_key_depends_on_text_version_and_parameters(baseline, monkeypatch):
+    analyzer = PDFAnalyzer("Some text.", cache=False)
+    key = analyzer._cache_key("keywords", 20)
+    assert key == PDFAnalyzer("Some text.", cache=False)._cache_key("keywords", 20)
+    assert key != PDFAnalyzer("Other text.", cache=False)._cache_key("keywords", 20)
+    assert key != analyzer._cache_key("keywords", 10)
+    assert key != analyzer._cache_key("summary", 20)
+
+    monkeypatch.setattr(pdf_analyzer, "ANALYSIS_CACHE_VERSION", pdf_analyzer.ANALYSIS_CACHE_VERSION + 1)
+    assert key != analyzer._cache_key("keywords", 20)
+
+def test_analysis_cache_round_trip(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    assert cache.get("missing") is None
+    cache.put("key", {"topic": ["a", "b"]})
+    assert cache.get("key") == {"topic": ["a", "b"]}
+
+def test_analysis_cache_prune_drops_least_recently_used(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    for age, key in enumerate(["newest", "middle", "oldest"]):
+        cache.put(key, "x" * 100)
+        os.utime(cache._path(key), (1000 - age, 1000 - age))
+    entry_size = os.path.getsize(cache._path("newest"))
+
+    # Reading an entry marks it as recently used
+    cache.get("oldest")
+    cache.max_bytes = entry_size
+    cache.prune()
+    assert sorted(os.listdir(tmp_path)) == ["oldest.json"]
@@ -0,0 +1,59 @@
+"""
+Tests for the on-disk OCR cache in pdf_processor.
+"""
+
+import os
+
+import pdf_processor
+from pdf_processor import OCRCache
+
+class FakeImage:
+    """Just enough of a PIL image for OCRCache.key."""
+    def __init__(self, data, mode="L", size=(2, 2)):
+        self.data = data
+        self.mode = mode
+        self.size = size
+
+    def tobytes(self):
+        return self.data
+
+def test_key_depends_on_image_config_and_version(tmp_path, monkeypatch):
+    cache = OCRCache(str(tmp_path))
+    key = cache.key(FakeImage(b"page"), "--psm 3")
+    assert key == cache.key(FakeImage(b"page"), "--psm 3")
+    assert key != cache.key(FakeImage(b"other"), "--psm 3")
+    assert key != cache.key(FakeImage(b"page", mode="RGB"), "--psm 3")
+    assert key != cache.key(FakeImage(b"page"), "--psm 6")
+
+    monkeypatch.setattr(pdf_processor, "OCR_CACHE_VERSION", pdf_processor.OCR_CACHE_VERSION + 1)
+    assert key != cache.key(FakeImage(b"page"), "--psm 3")
+
+def test_round_trip_keeps_text_exactly(tmp_path):
+    cache = OCRCache(str(tmp_path))
+    assert cache.get("missing") is None
+    cache.put("key", "line one\r\nline two\n")
+    assert cache.get("key") == "line one\r\nline two\n"
+
+def test_prune_drops_least_recently_used(tmp_path):
+    cache = OCRCache(str(tmp_path))
+    for age, key in enumerate(["newest", "middle", "oldest"]):
+        cache.put(key, "x" * 100)
+        os.utime(cache._path(key), (1000 - age, 1000 - age))
+
+    # Reading an entry marks it as recently used
+    cache.get("oldest")
+    cache.max_bytes = 100
+    cache.prune()
+    assert sorted(os.listdir(tmp_path)) == ["oldest.txt"]
+
+def test_first_put_prunes_past_max_bytes(tmp_path):
+    # Entries left by an earlier process
+    for age, key in enumerate(["older", "oldest"], 1):
+        path = os.path.join(tmp_path, f"{key}.txt")
+        with open(path, "w") as file:
+            file.write("x" * 100)
+        os.utime(path, (1000 - age, 1000 - age))
+
+    cache = OCRCache(str(tmp_path), max_bytes=250)
+    cache.put("new", "x" * 100)
+    assert sorted(os.listdir(tmp_path)) == ["new.txt", "older.txt"]
@@ -0,0 +1,104 @@
+"""
+Tests for toc_extractor, checked against the baseline module where the
+rewritten patterns should parse exactly as the original ones did.
+"""
+
+import random
+
+import pytest
+
+import toc_extractor
+from toc_extractor import TOCExtractor
+from baseline import load
+
+baseline = load("toc_extractor")
+
+# Pieces that random TOC and index lines are built from, chosen to hit the
+# numbering, dot leader, page number and whitespace cases of each pattern
+LINE_PIECES = ['٣', ' ', '...', '   ', '.....', '1.', '2.3.', ' ', '  ', '    ', '.', '..', '....',
+               'Chapter ', 'Part ', 'Section ', 'IV.', 'ii ', 'A.1 ', 'B.2.3 ', 'Intro', 'x', '10', '7', '-',
+               ',', ', ', '\t', 'see ', 'See also ', '9', '15-17']
+TEXT_PIECES = LINE_PIECES + ['\r', '\x0c', '\n', '\n', '\n']
+INDEX_PIECES = ['Algorithms', 'Data structures', 'x', ',', ', ', '10', '15-17', ', 23', '-', '.', '. ',
+                ' ', '  ', '    ', '\t', 'see ', 'See also ', 'SEE ']
+
+def random_text(rng, pieces, max_pieces):
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(1, max_pieces)))
+
+def entry_tuple(entry):
+    return None if entry is None else (entry.level, entry.title, entry.page_num, entry.raw_text)
+
+@pytest.fixture
+def flat_extractors(monkeypatch):
+    """Current and baseline extractors that leave TOC entries flat.
+
+    The baseline hierarchy step raised ValueError on every non-empty TOC, so
+    entries are compared before it runs.
+    """
+    for module in (toc_extractor, baseline):
+        monkeypatch.setattr(module.TOCExtractor, "_determine_hierarchy", lambda self: None)
+    return TOCExtractor, baseline.TOCExtractor
+
+def test_parse_toc_line_matches_baseline():
+    rng = random.Random(1)
+    current, original = TOCExtractor(), baseline.TOCExtractor()
+    for _ in range(20000):
+        line = random_text(rng, LINE_PIECES, 25)
+        assert entry_tuple(current._parse_toc_line(line)) == entry_tuple(original._parse_toc_line(line)), repr(line)
+
+def test_toc_entries_match_baseline(flat_extractors):
+    current_cls, original_cls = flat_extractors
+    rng = random.Random(2)
+    for _ in range(3000):
+        text = random_text(rng, TEXT_PIECES, 40)
+        current = [entry_tuple(e) for e in current_cls().extract_toc_from_text(text)]
+        original = [entry_tuple(e) for e in original_cls().extract_toc_from_text(text)]
+        assert current == original, repr(text)
+
+def test_index_entries_match_baseline(flat_extractors):
+    current_cls, original_cls = flat_extractors
+    rng = random.Random(3)
+    for _ in range(3000):
+        text = '\n'.join(random_text(rng, INDEX_PIECES, 10) for _ in range(rng.randint(1, 10)))
+        current = [e.to_dict() for e in current_cls().extract_toc_from_text(text, is_index=True)]
+        original = [e.to_dict() for e in original_cls().extract_toc_from_text(text, is_index=True)]
+        assert current == original, repr(text)
+
+def test_index_example():
+    text = ("Index\n"
+            "Algorithms, 10, 15-17, 23\n"
+            "  recursive, 15, 17\n"
+            "Data structures, 5\n")
+    entries = TOCExtractor().extract_toc_from_text(text, is_index=True)
+    assert [e.to_dict() for e in entries] == [e.to_dict() for e in baseline.TOCExtractor().extract_toc_from_text(text, is_index=True)]
+    assert entries[0].term == "Algorithms"
+    assert entries[0].page_refs == [10, 15, 16, 17, 23]
+
+def test_hierarchy_attaches_to_closest_entry_above():
+    text = ("1. Introduction....1\n"
+            "1.1. Background....2\n"
+            "2. Methods....5\n"
+            "2.1. Design....6\n"
+            "2.2. Setup....8\n")
+    roots = TOCExtractor().extract_toc_from_text(text)
+    assert [e.title for e in roots] == ["Introduction", "Methods"]
+    assert [e.title for e in roots[0].children] == ["Background"]
+    assert [e.title for e in roots[1].children] == ["Design", "Setup"]
+
+TOC_WORDS = ['Intro', 'Chapter', 'Methods', 'Results', 'a', 'Index', 'Appendix']
+
+def random_toc_line(rng):
+    indent = ' ' * rng.choice([0, 0, 2, 4, 6])
+    prefix = rng.choice(['1 ', '1.2 ', '1.2.3 ', 'A. ', '', '2.1. ']) if rng.random() < 0.3 else ''
+    separator = rng.choice([' ', ' .... ', '...', '  ', ''])
+    return indent + prefix + ' '.join(rng.choices(TOC_WORDS, k=rng.randint(1, 3))) + separator + str(rng.randint(1, 300))
+
+def test_count_entries_matches_extract_toc_roots():
+    rng = random.Random(4)
+    limit = 6
+    for _ in range(5000):
+        text = '\n'.join(random_toc_line(rng) if rng.random() < 0.8 else 'plain text'
+                         for _ in range(rng.randint(1, 15)))
+        roots = len(TOCExtractor().extract_toc_from_text(text))
+        count, _ = TOCExtractor().count_entries(text, limit=limit)
+        assert min(count, limit) == min(roots, limit), repr(text)
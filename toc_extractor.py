@@ -4,23 +4,120 @@ Table of Contents Extractor - Specialized module for extracting TOC and index en
 
 import re
 import logging
-from collections import OrderedDict
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _iter_lines(text):
+    """Yield the lines of text, split on '\\n' only, without holding a list of all of them."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+# Indentation for each TOC nesting level, two spaces per level, built once
+_INDENTS = tuple(' ' * (level * 2) for level in range(64))
+
+def _indent(level):
+    """Return the indentation for a TOC nesting level."""
+    return _INDENTS[level] if level < len(_INDENTS) else ' ' * (level * 2)
+
+# TOC line patterns, tried in order
+_TOC_PATTERNS = (
+    # Pattern 1: Classic TOC pattern with dots
+    # e.g. "1. Introduction..............10"
+    re.compile(r'(?P<prefix>(?:\d+\.)+\s*)?(?P<title>(?:.*[^.])?)\.{2,}(?P<page>\d+)$'),
+    
+    # Pattern 2: TOC with numbers without dots
+    # e.g. "1. Introduction 10" or "Chapter 1. Introduction 10"
+    re.compile(r'(?P<prefix>(?:(?:Chapter|Section|Part)\s+)?\d+\.?\s+)?(?P<title>(?:.*\S)?)\s+(?P<page>\d+)$'),
+    
+    # Pattern 3: TOC with Roman numerals
+    # e.g. "I. Introduction 10"
+    re.compile(r'(?P<prefix>[IVXivx]+\.?\s+)?(?P<title>(?:.*\S)?)\s+(?P<page>\d+)$'),
+    
+    # Pattern 4: TOC with alphanumeric identifiers
+    # e.g. "A.1 Introduction 10"
+    re.compile(r'(?P<prefix>[A-Z](?:\.\d+)+\s+)?(?P<title>(?:.*\S)?)\s+(?P<page>\d+)$'),
+    
+    # Pattern 5: Indented TOC without numbering
+    # e.g. "    Introduction..............10"
+    re.compile(r'^(?P<indent>\s{2,})(?P<title>(?:.*[^.])?)\.{2,}(?P<page>\d+)$'),
+    
+    # Pattern 6: Indented TOC without dots
+    # e.g. "    Introduction 10"
+    re.compile(r'^(?P<indent>\s{2,})(?P<title>(?:.*\S)?)\s+(?P<page>\d+)$')
+)
+
+# Index line patterns
+_INDEX_PATTERNS = (
+    # Pattern 1: Term with page number(s)
+    # e.g. "Algorithms, 10, 15-17, 23"
+    re.compile(r'(?P<term>.*?),\s*(?P<pages>(?:\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*))$'),
+    
+    # Pattern 2: Indented subentry
+    # e.g. "    recursive, 15, 17"
+    re.compile(r'^\s{2,}(?P<subterm>.*?),\s*(?P<pages>(?:\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*))$'),
+    
+    # Pattern 3: Term with see reference
+    # e.g. "Sorting, see Algorithms"
+    re.compile(r'(?P<term>.*?),\s*(?i:see)\s+(?P<reference>.*?)$'),
+    
+    # Pattern 4: Term with See also reference
+    # e.g. "Algorithms. See also Machine Learning"
+    re.compile(r'(?P<term>.*?)\.\s*(?i:See\s+also)\s+(?P<reference>.*?)$')
+)
+
+# Main entry and subentry patterns in one regex, main entries first as _extract_index
+# tries them; the subentry's pages group is renamed so the names stay unique
+_INDEX_ENTRY_PATTERN = re.compile(
+    f"(?P<main>{_INDEX_PATTERNS[0].pattern})"
+    f"|(?P<sub>{_INDEX_PATTERNS[1].pattern.replace('(?P<pages>', '(?P<subpages>')})"
+)
+
+# A single index page reference or page range, e.g. "10" or "15-17"
+_PAGE_REF = re.compile(r'(\d+)(?:-(\d+))?')
+
+def _combine_toc_patterns(patterns):
+    """Combine TOC patterns into one alternation tried in order, mapping each alternative's group to its pattern's groups."""
+    sources = []
+    for i, pattern in enumerate(patterns, 1):
+        source = pattern.pattern.replace('(?P<', f'(?P<p{i}_')
+        sources.append(f'(?P<p{i}>{source})')
+    combined = re.compile('|'.join(sources))
+    
+    # match.groups() positions of each alternative's title, page, prefix and indent (None if absent)
+    alternatives = {}
+    for i in range(1, len(patterns) + 1):
+        positions = [combined.groupindex.get(f'p{i}_{name}') for name in ('title', 'page', 'prefix', 'indent')]
+        alternatives[combined.groupindex[f'p{i}']] = (i, *[p - 1 if p else None for p in positions])
+    return combined, alternatives
+
+# All TOC patterns in a single regex, and what each of its alternatives captures
+_TOC_PATTERN, _TOC_ALTERNATIVES = _combine_toc_patterns(_TOC_PATTERNS)
+
 class TOCEntry:
     """Represents a single TOC entry with level, title, and page number."""
+    # Large TOCs create thousands of entries, so they skip the per-instance __dict__
+    __slots__ = ('level', 'title', 'page_num', 'raw_text', 'children', '_str_cache')
+    
     def __init__(self, level, title, page_num, raw_text=None):
         self.level = level
         self.title = title.strip()
         self.page_num = page_num
         self.raw_text = raw_text
         self.children = []  # For hierarchical TOCs
+        self._str_cache = None  # Formatted entry, built on first use; entries aren't changed after parsing
         
     def __str__(self):
-        return f"{' ' * (self.level*2)}{self.title} ({'p.' + str(self.page_num) if self.page_num else 'N/A'})"
+        if self._str_cache is None:
+            self._str_cache = f"{_indent(self.level)}{self.title} ({'p.' + str(self.page_num) if self.page_num else 'N/A'})"
+        return self._str_cache
         
     def to_dict(self):
         """Convert entry to dictionary representation."""
@@ -35,6 +132,8 @@ class TOCEntry:
 
 class IndexEntry:
     """Represents a single index entry with term and page references."""
+    __slots__ = ('term', 'page_refs', 'subentries')
+    
     def __init__(self, term, page_refs=None, subentries=None):
         self.term = term.strip()
         self.page_refs = page_refs or []
@@ -42,10 +141,9 @@ class IndexEntry:
         
     def __str__(self):
         page_str = ", ".join([str(p) for p in self.page_refs]) if self.page_refs else "N/A"
-        result = f"{self.term}: {page_str}"
-        for sub_term, sub_entry in self.subentries.items():
-            result += f"\n  {sub_term}: {', '.join([str(p) for p in sub_entry])}"
-        return result
+        lines = [f"{self.term}: {page_str}"]
+        lines.extend(f"  {sub_term}: {', '.join(map(str, sub_entry))}" for sub_term, sub_entry in self.subentries.items())
+        return "\n".join(lines)
         
     def to_dict(self):
         """Convert entry to dictionary representation."""
@@ -54,7 +152,7 @@ class IndexEntry:
             "page_refs": self.page_refs
         }
         if self.subentries:
-            result["subentries"] = {term: pages for term, pages in self.subentries.items()}
+            result["subentries"] = dict(self.subentries)
         return result
 
 class TOCExtractor:
@@ -63,59 +161,15 @@ class TOCExtractor:
     def __init__(self):
         """Initialize the TOC extractor."""
         self.toc_entries = []
-        self.index_entries = OrderedDict()
-        self.toc_patterns = self._compile_toc_patterns()
-        self.index_patterns = self._compile_index_patterns()
-        
-    def _compile_toc_patterns(self):
-        """Compile regex patterns for TOC extraction."""
-        patterns = [
-            # Pattern 1: Classic TOC pattern with dots
-            # e.g. "1. Introduction..............10"
-            re.compile(r'(?P<prefix>(?:\d+\.)+\s*)?(?P<title>.*?)\.{2,}(?P<page>\d+)$'),
-            
-            # Pattern 2: TOC with numbers without dots
-            # e.g. "1. Introduction 10" or "Chapter 1. Introduction 10"
-            re.compile(r'(?P<prefix>(?:(?:Chapter|Section|Part)\s+)?\d+\.?\s+)?(?P<title>.*?)\s+(?P<page>\d+)$'),
-            
-            # Pattern 3: TOC with Roman numerals
-            # e.g. "I. Introduction 10"
-            re.compile(r'(?P<prefix>[IVXivx]+\.?\s+)?(?P<title>.*?)\s+(?P<page>\d+)$'),
-            
-            # Pattern 4: TOC with alphanumeric identifiers
-            # e.g. "A.1 Introduction 10"
-            re.compile(r'(?P<prefix>[A-Z](?:\.\d+)+\s+)?(?P<title>.*?)\s+(?P<page>\d+)$'),
-            
-            # Pattern 5: Indented TOC without numbering
-            # e.g. "    Introduction..............10"
-            re.compile(r'^(?P<indent>\s{2,})(?P<title>.*?)\.{2,}(?P<page>\d+)$'),
-            
-            # Pattern 6: Indented TOC without dots
-            # e.g. "    Introduction 10"
-            re.compile(r'^(?P<indent>\s{2,})(?P<title>.*?)\s+(?P<page>\d+)$')
-        ]
-        return patterns
-    
-    def _compile_index_patterns(self):
-        """Compile regex patterns for index extraction."""
-        patterns = [
-            # Pattern 1: Term with page number(s)
-            # e.g. "Algorithms, 10, 15-17, 23"
-            re.compile(r'(?P<term>.*?),\s*(?P<pages>(?:\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*))$'),
-            
-            # Pattern 2: Indented subentry
-            # e.g. "    recursive, 15, 17"
-            re.compile(r'^\s{2,}(?P<subterm>.*?),\s*(?P<pages>(?:\d+(?:-\d+)?(?:,\s*\d+(?:-\d+)?)*))$'),
-            
-            # Pattern 3: Term with see reference
-            # e.g. "Sorting, see Algorithms"
-            re.compile(r'(?P<term>.*?),\s*see\s+(?P<reference>.*?)$', re.IGNORECASE),
-            
-            # Pattern 4: Term with See also reference
-            # e.g. "Algorithms. See also Machine Learning"
-            re.compile(r'(?P<term>.*?)\.\s*See\s+also\s+(?P<reference>.*?)$', re.IGNORECASE)
-        ]
-        return patterns
+        self.index_entries = {}  # Term -> IndexEntry, in the order terms appear
+        # (entries, structure) from the last get_*_structure call; entries aren't changed after
+        # extraction, so a structure is rebuilt only when a new list or dict of them is in place
+        self._toc_structure = None
+        self._index_structure = None
+        # Patterns are compiled once at import, not for every extractor
+        self.toc_patterns = _TOC_PATTERNS
+        self.toc_pattern = _TOC_PATTERN
+        self.index_patterns = _INDEX_PATTERNS
         
     def extract_toc_from_text(self, text, is_index=False):
         """Extract TOC or index entries from text."""
@@ -127,16 +181,18 @@ class TOCExtractor:
     def _extract_toc(self, text):
         """Extract Table of Contents entries from text."""
         self.toc_entries = []
-        lines = text.split('\n')
+        self._toc_structure = None
         
         # First pass - identify TOC entries
-        for line_num, line in enumerate(lines):
+        for line in _iter_lines(text):
             line = line.rstrip()
-            if not line.strip():
+            
+            # Skip blank lines and obvious non-TOC lines like headers/footers
+            if len(line.strip()) < 5:
                 continue
                 
-            # Skip obvious non-TOC lines like headers/footers
-            if len(line.strip()) < 5:
+            # Every TOC pattern ends in a page number
+            if not line[-1:].isdecimal():
                 continue
                 
             entry = self._parse_toc_line(line)
@@ -150,61 +206,123 @@ class TOCExtractor:
         logger.info(f"Extracted {len(self.toc_entries)} TOC entries")
         return self.toc_entries
         
-    def _parse_toc_line(self, line):
-        """Parse a single line of text to extract TOC information."""
-        # Try all patterns
-        for pattern in self.toc_patterns:
-            match = pattern.match(line)
-            if match:
-                groups = match.groupdict()
-                
-                # Extract title
-                title = groups.get('title', '').strip()
+    def count_entries(self, text, limit):
+        """Count top-level TOC entries and index terms in one pass, stopping at limit top-level entries."""
+        toc_count = 0
+        min_level = None  # Lowest level of the TOC entries seen so far
+        index_terms = set()
+        
+        for line in _iter_lines(text):
+            line = line.rstrip()
+            stripped = line.strip()
+            if not stripped:
+                continue
                 
-                # Extract page number
-                page_num = None
-                if 'page' in groups and groups['page']:
-                    try:
-                        page_num = int(groups['page'])
-                    except ValueError:
-                        pass
+            # TOC and index entries all end in a page number
+            if not line[-1:].isdecimal():
+                continue
                 
-                # Determine level based on prefix, indent, or position
-                level = 0
-                if 'prefix' in groups and groups['prefix']:
-                    # Count dots or depth indicators
-                    prefix = groups['prefix'].strip()
-                    level = prefix.count('.') 
-                    if level == 0 and prefix:  # If no dots but has prefix
-                        level = 1
-                elif 'indent' in groups and groups['indent']:
-                    # Determine level by indentation
-                    level = len(groups['indent']) // 2
+            # Main index entries, as matched by _extract_index, always have a comma
+            match = self.index_patterns[0].match(line) if ',' in line else None
+            if match:
+                term = match.group('term').strip()
+                if term:
+                    index_terms.add(term)
+                    
+            # TOC entries, skipping the same short lines as _extract_toc
+            if len(stripped) >= 5:
+                entry = self._parse_toc_line(line)
+                if entry:
+                    # As in _determine_hierarchy, an entry is top-level unless an entry
+                    # at a lower level comes before it
+                    if min_level is None or entry.level <= min_level:
+                        min_level = entry.level
+                        toc_count += 1
+                        # Top-level entries are never demoted, so enough of them settles the count
+                        if toc_count >= limit:
+                            break
+                        
+        return toc_count, len(index_terms)
+        
+    def _parse_toc_line(self, line):
+        """Parse a single line of text to extract TOC information."""
+        # Every pattern ends in a page number, so other lines can't be entries
+        if not line[-1:].isdecimal():
+            return None
+            
+        # ...separated from the title by spaces or a dot leader, so other lines can be
+        # turned away without running any pattern
+        end = len(line) - 1
+        while end and line[end - 1].isdecimal():
+            end -= 1
+        if not line[end - 1:end].isspace() and line[end - 2:end] != '..':
+            return None
+            
+        # Try all patterns at once; the combined pattern finds the first one that matches
+        match = self.toc_pattern.match(line)
+        if match:
+            pattern_num, title, page, prefix, indent = _TOC_ALTERNATIVES[match.lastindex]
+            groups = match.groups()
+            entry = self._toc_entry(line, groups[title], groups[page],
+                                    groups[prefix] if prefix is not None else None,
+                                    groups[indent] if indent is not None else None)
+            if entry:
+                return entry
                 
-                if title:  # Skip if no title extracted
-                    return TOCEntry(level, title, page_num, line)
+            # A match with no title falls through to the patterns after it
+            for pattern in self.toc_patterns[pattern_num:]:
+                match = pattern.match(line)
+                if match:
+                    groups = match.groupdict()
+                    entry = self._toc_entry(line, groups['title'], groups['page'], groups.get('prefix'), groups.get('indent'))
+                    if entry:
+                        return entry
+        
+        # Last resort - take a page number after the last space
+        parts = line.rsplit(None, 1)
+        if len(parts) == 2 and parts[1].isdecimal():
+            title = parts[0].strip()
+            page_num = int(parts[1])
+            # Guess level based on indentation
+            leading_spaces = len(line) - len(line.lstrip())
+            level = leading_spaces // 2
+            return TOCEntry(level, title, page_num, line)
+            
+        return None
         
-        # Last resort - look for page numbers at the end
-        page_match = re.search(r'(\S+)\s+(\d+)$', line)
-        if page_match:
+    def _toc_entry(self, line, title, page, prefix, indent):
+        """Build a TOC entry from the groups of a pattern match, or None if it has no title."""
+        # Extract title
+        title = (title or '').strip()
+        if not title:  # Skip if no title extracted
+            return None
+            
+        # Extract page number
+        page_num = None
+        if page:
             try:
-                title = line[:page_match.start()].strip()
-                page_num = int(page_match.group(2))
-                # Guess level based on indentation
-                leading_spaces = len(line) - len(line.lstrip())
-                level = leading_spaces // 2
-                return TOCEntry(level, title, page_num, line)
-            except:
+                page_num = int(page)
+            except ValueError:
                 pass
-                
-        return None
+        
+        # Determine level based on prefix, indent, or position
+        level = 0
+        if prefix:
+            # Count dots or depth indicators
+            prefix = prefix.strip()
+            level = prefix.count('.') 
+            if level == 0 and prefix:  # If no dots but has prefix
+                level = 1
+        elif indent:
+            # Determine level by indentation
+            level = len(indent) // 2
+            
+        return TOCEntry(level, title, page_num, line)
         
     def _determine_hierarchy(self):
         """Determine hierarchical relationships between TOC entries."""
-        # Sort by level and position
-        self.toc_entries.sort(key=lambda x: (x.level, self.toc_entries.index(x)))
-        
-        # Build hierarchy
+        # Build hierarchy, walking entries in document order so each one's parent is the
+        # closest entry above it at a lower level
         hierarchy = []
         last_by_level = {0: None}
         
@@ -232,29 +350,27 @@ class TOCExtractor:
         
     def _extract_index(self, text):
         """Extract index entries from text."""
-        self.index_entries = OrderedDict()
-        lines = text.split('\n')
+        self.index_entries = {}
+        self._index_structure = None
         
         current_main_term = None
         
-        for line_num, line in enumerate(lines):
+        for line in _iter_lines(text):
             line = line.rstrip()
             if not line.strip():
                 continue
                 
-            # Check for main entry patterns
-            main_entry_match = None
-            for pattern in self.index_patterns[:1]:  # Use first pattern for main entries
-                match = pattern.match(line)
-                if match:
-                    main_entry_match = match
-                    break
-                    
+            # Main entries and subentries both end in a page number after a comma
+            if not line[-1:].isdecimal() or ',' not in line:
+                continue
+                
+            # Check for main entry and subentry patterns with a single match
+            match = _INDEX_ENTRY_PATTERN.match(line)
+            
             # If main entry found
-            if main_entry_match:
-                groups = main_entry_match.groupdict()
-                term = groups.get('term', '').strip()
-                pages_str = groups.get('pages', '')
+            if match and match.lastgroup == 'main':
+                term = match.group('term').strip()
+                pages_str = match.group('pages')
                 
                 if term:
                     # Parse page numbers
@@ -265,26 +381,17 @@ class TOCExtractor:
                     current_main_term = term
                     
             # Check for subentry pattern
-            elif current_main_term and line.startswith(' '):
-                subentry_match = None
-                for pattern in self.index_patterns[1:2]:  # Use pattern for subentries
-                    match = pattern.match(line)
-                    if match:
-                        subentry_match = match
-                        break
-                        
-                if subentry_match:
-                    groups = subentry_match.groupdict()
-                    subterm = groups.get('subterm', '').strip()
-                    pages_str = groups.get('pages', '')
+            elif match and current_main_term and line.startswith(' '):
+                subterm = match.group('subterm').strip()
+                pages_str = match.group('subpages')
+                
+                if subterm:
+                    # Parse page numbers
+                    page_refs = self._parse_page_refs(pages_str)
                     
-                    if subterm:
-                        # Parse page numbers
-                        page_refs = self._parse_page_refs(pages_str)
-                        
-                        # Add to main entry
-                        main_entry = self.index_entries[current_main_term]
-                        main_entry.subentries[subterm] = page_refs
+                    # Add to main entry
+                    main_entry = self.index_entries[current_main_term]
+                    main_entry.subentries[subterm] = page_refs
                         
         logger.info(f"Extracted {len(self.index_entries)} index entries")
         return list(self.index_entries.values())
@@ -298,43 +405,41 @@ class TOCExtractor:
         chunks = [p.strip() for p in pages_str.split(',')]
         
         for chunk in chunks:
-            if '-' in chunk:  # Page range
-                try:
-                    start, end = chunk.split('-')
-                    start, end = int(start), int(end)
-                    page_refs.extend(range(start, end + 1))
-                except:
-                    # If parsing fails, add as is
-                    page_refs.append(chunk)
-            else:
-                try:
-                    page_refs.append(int(chunk))
-                except:
-                    # If not a number, add as is
-                    if chunk:
-                        page_refs.append(chunk)
+            match = _PAGE_REF.fullmatch(chunk)
+            if match:
+                start, end = match.groups()
+                if end is None:
+                    page_refs.append(int(start))
+                else:  # Page range
+                    page_refs.extend(range(int(start), int(end) + 1))
+            elif chunk:
+                # If not a number or range, add as is
+                page_refs.append(chunk)
                         
         return page_refs
         
     def get_toc_structure(self):
         """Get the hierarchical TOC structure as a list of dictionaries."""
-        return [entry.to_dict() for entry in self.toc_entries]
+        if self._toc_structure is None or self._toc_structure[0] is not self.toc_entries:
+            self._toc_structure = (self.toc_entries, [entry.to_dict() for entry in self.toc_entries])
+        return self._toc_structure[1]
         
     def get_index_structure(self):
         """Get the index structure as a list of dictionaries."""
-        return [entry.to_dict() for entry in self.index_entries.values()]
+        if self._index_structure is None or self._index_structure[0] is not self.index_entries:
+            self._index_structure = (self.index_entries, [entry.to_dict() for entry in self.index_entries.values()])
+        return self._index_structure[1]
         
     def display_toc(self):
         """Return a formatted string representation of the TOC."""
         output = []
         
-        def _format_entry(entry, indent=0):
-            output.append(f"{' ' * indent}{entry}")
-            for child in entry.children:
-                _format_entry(child, indent + 2)
-                
-        for entry in self.toc_entries:
-            _format_entry(entry)
+        # Walk the tree depth first with an explicit stack, children in their original order
+        stack = [(entry, 0) for entry in reversed(self.toc_entries)]
+        while stack:
+            entry, depth = stack.pop()
+            output.append(f"{_indent(depth)}{entry}")
+            stack.extend((child, depth + 1) for child in reversed(entry.children))
             
         return "\n".join(output)
         
@@ -355,33 +460,21 @@ class TOCExtractor:
         num_sections = len(self.toc_entries)
         max_depth = 0
         
-        def get_depth(entry, current_depth=1):
-            if not entry.children:
-                return current_depth
-            return max(get_depth(child, current_depth + 1) for child in entry.children)
-            
-        for entry in self.toc_entries:
-            depth = get_depth(entry)
+        # Walk the whole tree once, finding its depth and the range of pages referenced
+        min_page = max_page = None
+        stack = [(entry, 1) for entry in self.toc_entries]
+        while stack:
+            entry, depth = stack.pop()
             if depth > max_depth:
                 max_depth = depth
-                
-        # Collect all pages referenced
-        pages = []
-        
-        def collect_pages(entry):
             if entry.page_num:
-                pages.append(entry.page_num)
-            for child in entry.children:
-                collect_pages(child)
-                
-        for entry in self.toc_entries:
-            collect_pages(entry)
+                if min_page is None or entry.page_num < min_page:
+                    min_page = entry.page_num
+                if max_page is None or entry.page_num > max_page:
+                    max_page = entry.page_num
+            stack.extend((child, depth + 1) for child in entry.children)
             
-        # Sort and find range
-        if pages:
-            pages.sort()
-            min_page = min(pages)
-            max_page = max(pages)
+        if min_page is not None:
             page_range = f"{min_page}-{max_page}"
         else:
             page_range = "unknown"
@@ -0,0 +1,8 @@
+"""
+WSGI entry point for serving the web interface with a production server.
+
+Example:
+    gunicorn -w 4 -k gthread --threads 4 wsgi:application
+"""
+
+from app import app as application